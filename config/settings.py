@@ -79,6 +79,8 @@ REGIME_MODEL_PATH = os.path.join(MODELS_DIRECTORY, "regime_detector.pkl")
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
 LOG_RETENTION_DAYS = int(os.getenv("LOG_RETENTION_DAYS", "30"))
 LOG_FILE = "kiwi_ai.log"
+ERROR_DB_FILE = os.getenv("ERROR_DB_FILE", "errors.db")  # SQLite archive of dashboard errors
+ERROR_DB_MAX_ROWS = int(os.getenv("ERROR_DB_MAX_ROWS", "50000"))  # Oldest archived errors beyond this are pruned
 
 # ================================
 # DASHBOARD CONFIGURATION
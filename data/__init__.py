@@ -4,5 +4,6 @@ Handles market data fetching, storage, and retrieval.
 """
 
 from .data_handler import DataHandler
+from .bar_ring import BarRing
 
-__all__ = ['DataHandler']
+__all__ = ['DataHandler', 'BarRing']
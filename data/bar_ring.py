@@ -0,0 +1,98 @@
+"""
+Bar Ring Module
+Fixed-capacity OHLCV history stored column-wise in NumPy arrays.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class BarRing:
+    """
+    Ring buffer of the most recent bars for one symbol, one array per field.
+
+    Every value is written twice, at slot i and i + capacity, so the newest
+    bars always form one contiguous slice and the column accessors return
+    views instead of copies.
+    """
+
+    __slots__ = ('ts', 'o', 'h', 'l', 'c', 'v', 'head', 'cap')
+
+    def __init__(self, capacity: int):
+        """
+        Initialize an empty ring.
+
+        Args:
+            capacity: Number of bars kept; older bars are overwritten
+        """
+        self.cap = capacity
+        self.head = 0  # Bars appended so far (also counts overwritten ones)
+        self.ts = np.empty(2 * capacity, dtype=np.int64)  # UTC nanoseconds
+        self.o = np.empty(2 * capacity, dtype=np.float32)
+        self.h = np.empty(2 * capacity, dtype=np.float32)
+        self.l = np.empty(2 * capacity, dtype=np.float32)
+        self.c = np.empty(2 * capacity, dtype=np.float32)
+        self.v = np.empty(2 * capacity, dtype=np.float32)
+
+    def __len__(self):
+        return min(self.head, self.cap)
+
+    def append(self, timestamp, open_, high, low, close, volume):
+        """
+        Add one bar, overwriting the oldest once the ring is full.
+
+        Args:
+            timestamp: Bar time (datetime, pandas Timestamp or UTC nanoseconds)
+            open_, high, low, close, volume: Bar values
+        """
+        i = self.head % self.cap
+        ts = pd.Timestamp(timestamp).value
+        for column, value in ((self.ts, ts), (self.o, open_), (self.h, high),
+                              (self.l, low), (self.c, close), (self.v, volume)):
+            column[i] = column[i + self.cap] = value
+        self.head += 1
+
+    def extend(self, df: pd.DataFrame):
+        """
+        Add the rows of an OHLCV DataFrame indexed by timestamp, oldest first.
+
+        Args:
+            df: DataFrame with open/high/low/close/volume columns
+        """
+        for row in df.tail(self.cap).itertuples():
+            self.append(row.Index, row.open, row.high, row.low, row.close, row.volume)
+
+    def _window(self):
+        """Return the slice holding the stored bars, oldest to newest."""
+        end = (self.head - 1) % self.cap + self.cap + 1
+        return slice(end - len(self), end)
+
+    @property
+    def close(self) -> np.ndarray:
+        """Closing prices, oldest to newest (a view)."""
+        return self.c[self._window()]
+
+    @property
+    def volume(self) -> np.ndarray:
+        """Volumes, oldest to newest (a view)."""
+        return self.v[self._window()]
+
+    def as_dataframe(self) -> pd.DataFrame:
+        """
+        Return the stored bars as an OHLCV DataFrame indexed by timestamp.
+
+        The value columns are built over views of the ring; callers must treat
+        the frame as read-only.
+        """
+        window = self._window()
+        return pd.DataFrame(
+            {
+                'open': self.o[window],
+                'high': self.h[window],
+                'low': self.l[window],
+                'close': self.c[window],
+                'volume': self.v[window]
+            },
+            index=pd.DatetimeIndex(pd.to_datetime(self.ts[window], utc=True), name='timestamp'),
+            copy=False
+        )
@@ -11,6 +11,50 @@ import os
 from pathlib import Path
 import config
 
+# Optional JIT compiler for the rule-based kernel (falls back to plain NumPy)
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit."""
+        return lambda func: func
+
+
+@njit(cache=True)
+def _regime_stats(close, window):
+    """
+    Reduce a close-price series to the rule-based regime inputs.
+
+    Matches the pandas formulation (pct_change, rolling std/mean with ddof=1,
+    least-squares slope over the last window) without building any Series.
+
+    Args:
+        close: float32 array of closing prices, oldest first
+        window: Lookback for the rolling statistics and the slope
+
+    Returns:
+        (volatility, mean_return, normalized_slope, overall_volatility);
+        NaN where pandas would produce NaN
+    """
+    n = close.shape[0]
+    returns = close[1:] / close[:-1] - 1.0
+    volatility = np.nan
+    mean_return = np.nan
+    if returns.shape[0] >= window:
+        recent = returns[-window:]
+        mean_return = recent.mean()
+        volatility = np.sqrt(((recent - mean_return) ** 2).sum() / (window - 1))
+    overall_volatility = np.nan
+    if returns.shape[0] > 1:
+        overall_volatility = np.sqrt(((returns - returns.mean()) ** 2).sum() / (returns.shape[0] - 1))
+    tail = close[n - min(n, window):]
+    x = np.arange(tail.shape[0]) - (tail.shape[0] - 1) / 2.0
+    slope = (x * (tail - tail.mean())).sum() / (x * x).sum()
+    return volatility, mean_return, slope / tail[-1], overall_volatility
+
 
 class RegimeDetector:
     """
@@ -168,19 +212,14 @@ class RegimeDetector:
         if len(data) < 20:
             return 'SIDEWAYS'
         
-        # Calculate metrics
-        returns = data['close'].pct_change()
-        volatility = returns.rolling(window=20).std().iloc[-1]
-        mean_return = returns.rolling(window=20).mean().iloc[-1]
-        
-        # Calculate trend strength using linear regression slope
-        close_prices = data['close'].tail(20).values
-        x = np.arange(len(close_prices))
-        slope = np.polyfit(x, close_prices, 1)[0]
-        normalized_slope = slope / close_prices[-1]  # Normalize by current price
+        # Rolling volatility/mean return, and trend strength as the linear
+        # regression slope normalized by the current price
+        volatility, mean_return, normalized_slope, overall_volatility = _regime_stats(
+            data['close'].to_numpy(dtype=np.float32), 20
+        )
         
         # Classification rules
-        high_volatility_threshold = returns.std() * 1.5
+        high_volatility_threshold = overall_volatility * 1.5
         trend_threshold = 0.001  # 0.1% per day
         
         if volatility > high_volatility_threshold:
@@ -190,6 +229,11 @@ class RegimeDetector:
         else:
             return 'SIDEWAYS'
     
+    def warm_up(self):
+        """Compile the rule-based kernel ahead of the first live bar (no-op without numba)."""
+        if NUMBA_AVAILABLE:
+            _regime_stats(np.linspace(100.0, 110.0, 100, dtype=np.float32), 20)
+    
     def get_regime_confidence(self, data: pd.DataFrame, recent_bars: int = 50) -> dict:
         """
         Get confidence scores for each regime.
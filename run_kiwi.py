@@ -26,17 +26,27 @@ Features:
 
 import os
 print("Script execution started...")
+import re
 import sys
 import time
 import signal
+import tempfile
 import threading
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from typing import List, Dict, Optional
-from collections import deque
+from collections import deque, Counter
+from dataclasses import dataclass, field, fields
+from operator import attrgetter
+from string import Template
+from functools import lru_cache, partial
+from itertools import accumulate, islice
+from urllib.parse import quote
 import json
-import plotly.graph_objects as go
+import zlib
+import inspect
+from importlib.util import find_spec
 
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -54,51 +64,94 @@ except ImportError:
 # Import Kiwi AI modules
 import config
 from data.data_handler import DataHandler
+from data.bar_ring import BarRing
 from meta_ai.regime_detector import RegimeDetector
 from meta_ai.performance_monitor import PerformanceMonitor
 from meta_ai.strategy_selector import StrategySelector
 from execution.broker_interface import Broker
 from execution.risk_manager import RiskManager
-from strategies.trend_following import TrendFollowingStrategy
-from strategies.mean_reversion import MeanReversionStrategy
-from strategies.volatility_breakout import VolatilityBreakoutStrategy
 from utils.logger import TradingLogger
 from utils.ui import load_css
+from utils.error_store import get_error_store
 
-# Try to import real-time streaming
+# Real-time streaming support - detected here, imported when a stream is opened
+REALTIME_AVAILABLE = find_spec('alpaca_trade_api') is not None
+
+# Optional fast JSON serializer (falls back to the json module)
 try:
-    import alpaca_trade_api as tradeapi
-    REALTIME_AVAILABLE = True
+    import orjson
+    ORJSON_AVAILABLE = True
 except ImportError:
-    REALTIME_AVAILABLE = False
+    ORJSON_AVAILABLE = False
 
 # Initialize logger
 logger = TradingLogger()
 
+# Error log capacity (entries) - the oldest entries drop off once full;
+# the size can be changed from the Error Log page
+_ERROR_LOG_MAXLEN = 100
+_ERROR_LOG_SIZES = (100, 500, 1000, 5000)
+# Error Log page renders this many entries at a time
+_ERROR_PAGE_SIZE = 50
+# Trades and log lines kept in the session (newest first)
+_RECENT_TRADES_MAXLEN = 500
+_LOG_MESSAGES_MAXLEN = 500
+
+@st.cache_resource(show_spinner=False)
+def _state_init_lock():
+    """
+    Lock serializing first-time TradingState setup.
+
+    Cached per process: a plain module-level lock would be rebuilt on every
+    script rerun and could not order two overlapping reruns.
+    """
+    return threading.Lock()
+
+
 # Global state for trading system - using Streamlit session state to persist across reruns
 class TradingState:
-    """Global trading state manager."""
+    """
+    Global trading state manager.
+
+    Every field lives in st.session_state; attribute reads and writes on this
+    object are routed there, with a missing key filled from _DEFAULTS.
+    Callable defaults are factories, so each session gets its own container.
+    """
+    _DEFAULTS = {
+        'running': False,
+        'mode': None,  # 'daily' or 'realtime'
+        'thread': None,
+        'broker': None,
+        'positions': list,
+        'account': dict,
+        'current_regime': "Unknown",
+        'current_strategy': "None",
+        'performance_metrics': dict,
+        'recent_trades': partial(deque, maxlen=_RECENT_TRADES_MAXLEN),  # Newest first
+        'log_messages': partial(deque, maxlen=_LOG_MESSAGES_MAXLEN),
+        'error_log': partial(deque, maxlen=_ERROR_LOG_MAXLEN),  # Newest first
+        'error_log_version': 0,  # Bumped on every error_log change
+        'error_types': Counter,  # error_log entry type -> entries in the log
+        'error_severities': Counter,  # error_log severity -> entries in the log
+        'stream': None,
+        'bar_history': dict,  # symbol -> BarRing of recent bars
+        'bar_count': 0,  # Bumped on every bar added to bar_history
+        'last_signal': None,
+        'position_state': None,
+        'notification': None,
+        'connecting': False,  # Flag to prevent multiple connection attempts
+        'stop_event': threading.Event,  # Set on stop, waking a sleeping trading loop at once
+    }
+    
     def __init__(self):
-        # Check if already initialized in session state
-        if 'initialized' not in st.session_state:
-            st.session_state.running = False
-            st.session_state.mode = None  # 'daily' or 'realtime'
-            st.session_state.thread = None
-            st.session_state.broker = None
-            st.session_state.positions = []
-            st.session_state.account = {}
-            st.session_state.current_regime = "Unknown"
-            st.session_state.current_strategy = "None"
-            st.session_state.performance_metrics = {}
-            st.session_state.recent_trades = []
-            st.session_state.log_messages = []
-            st.session_state.error_log = []
-            st.session_state.stream = None
-            st.session_state.bar_history = []
-            st.session_state.last_signal = None
-            st.session_state.position_state = None
-            st.session_state.notification = None
-            st.session_state.connecting = False  # Flag to prevent multiple connection attempts
+        # Check if already initialized in session state (every rerun after the first)
+        if st.session_state.get('initialized'):
+            return
+        with _state_init_lock():
+            if st.session_state.get('initialized'):
+                return
+            for name, default in self._DEFAULTS.items():
+                st.session_state[name] = default() if callable(default) else default
             # TradingView Toolbar State
             st.session_state.chart_toolbar = {
                 'compare_symbols': [],
@@ -114,151 +167,23 @@ class TradingState:
             }
             st.session_state.initialized = True
     
-    @property
-    def running(self):
-        return st.session_state.get('running', False)
-    
-    @running.setter
-    def running(self, value):
-        st.session_state.running = value
-    
-    @property
-    def mode(self):
-        return st.session_state.get('mode', None)
-    
-    @mode.setter
-    def mode(self, value):
-        st.session_state.mode = value
-    
-    @property
-    def thread(self):
-        return st.session_state.get('thread', None)
-    
-    @thread.setter
-    def thread(self, value):
-        st.session_state.thread = value
-    
-    @property
-    def broker(self):
-        return st.session_state.get('broker', None)
-    
-    @broker.setter
-    def broker(self, value):
-        st.session_state.broker = value
-    
-    @property
-    def positions(self):
-        return st.session_state.get('positions', [])
-    
-    @positions.setter
-    def positions(self, value):
-        st.session_state.positions = value
-    
-    @property
-    def account(self):
-        return st.session_state.get('account', {})
-    
-    @account.setter
-    def account(self, value):
-        st.session_state.account = value
-    
-    @property
-    def current_regime(self):
-        return st.session_state.get('current_regime', "Unknown")
-    
-    @current_regime.setter
-    def current_regime(self, value):
-        st.session_state.current_regime = value
-    
-    @property
-    def current_strategy(self):
-        return st.session_state.get('current_strategy', "None")
-    
-    @current_strategy.setter
-    def current_strategy(self, value):
-        st.session_state.current_strategy = value
-    
-    @property
-    def performance_metrics(self):
-        return st.session_state.get('performance_metrics', {})
-    
-    @performance_metrics.setter
-    def performance_metrics(self, value):
-        st.session_state.performance_metrics = value
-    
-    @property
-    def recent_trades(self):
-        return st.session_state.get('recent_trades', [])
-    
-    @recent_trades.setter
-    def recent_trades(self, value):
-        st.session_state.recent_trades = value
-    
-    @property
-    def log_messages(self):
-        return st.session_state.get('log_messages', [])
-    
-    @log_messages.setter
-    def log_messages(self, value):
-        st.session_state.log_messages = value
-    
-    @property
-    def error_log(self):
-        return st.session_state.get('error_log', [])
-    
-    @error_log.setter
-    def error_log(self, value):
-        st.session_state.error_log = value
-    
-    @property
-    def stream(self):
-        return st.session_state.get('stream', None)
-    
-    @stream.setter
-    def stream(self, value):
-        st.session_state.stream = value
-    
-    @property
-    def bar_history(self):
-        return st.session_state.get('bar_history', [])
-    
-    @bar_history.setter
-    def bar_history(self, value):
-        st.session_state.bar_history = value
-        
-    @property
-    def last_signal(self):
-        return st.session_state.get('last_signal', None)
-        
-    @last_signal.setter
-    def last_signal(self, value):
-        st.session_state.last_signal = value
-        
-    @property
-    def position_state(self):
-        return st.session_state.get('position_state', None)
-        
-    @position_state.setter
-    def position_state(self, value):
-        st.session_state.position_state = value
-        
-    @property
-    def notification(self):
-        return st.session_state.get('notification', None)
-        
-    @notification.setter
-    def notification(self, value):
-        st.session_state.notification = value
-    
-    @property
-    def connecting(self):
-        return st.session_state.get('connecting', False)
-        
-    @connecting.setter
-    def connecting(self, value):
-        st.session_state.connecting = value
+    def __getattr__(self, name):
+        # Only reached for names not found on the instance or class
+        try:
+            default = self._DEFAULTS[name]
+        except KeyError:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}") from None
+        state = st.session_state
+        if name not in state:
+            state[name] = default() if callable(default) else default
+        return state[name]
+    
+    def __setattr__(self, name, value):
+        if name not in self._DEFAULTS:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+        st.session_state[name] = value
+
 
-        
 trading_state = TradingState()
 
 
@@ -307,6 +232,14 @@ ASSET_CATEGORIES = {
     }
 }
 
+# Flat, parallel views of ASSET_CATEGORIES for the selectors: asset names and
+# symbols in category order, plus each category's slice of them
+_ASSET_CATEGORY_NAMES = tuple(ASSET_CATEGORIES)
+_ASSET_NAMES = tuple(name for assets in ASSET_CATEGORIES.values() for name in assets)
+_ASSET_SYMBOLS = tuple(symbol for assets in ASSET_CATEGORIES.values() for symbol in assets.values())
+_asset_bounds = (0, *accumulate(len(assets) for assets in ASSET_CATEGORIES.values()))
+_ASSET_CATEGORY_SLICES = tuple(slice(start, end) for start, end in zip(_asset_bounds, _asset_bounds[1:]))
+
 def create_nav_button(icon_name: str, text: str, key: str, is_active: bool = False, expand_icon: str = ""):
     """
     Create a custom navigation button with Iconly icon that works with Streamlit.
@@ -399,44 +332,51 @@ def get_iconly_icon(icon_name: str, size: int = 20, color: str = "currentColor")
     }
     return icons.get(icon_name, '')
 
+# Editor-only parts of the exported logo SVG: XML prolog, Inkscape/Sodipodi view
+# state and namespaces, potrace metadata, the empty <defs/>, and element ids
+# (which would be duplicated each time the logo appears on the page)
+_SVG_EDITOR_CRUFT = re.compile(
+    r'<\?xml.*?\?>|<sodipodi:namedview.*?/>|<metadata.*?</metadata>|<defs[^>]*/>'
+    r'|\s(?:id|xmlns:\w+|(?:sodipodi|inkscape):[\w-]+)="[^"]*"',
+    re.S
+)
+
+
+@st.cache_resource(show_spinner=False)
+def _logo_svg_markup():
+    """Read the logo SVG once per process, stripped of editor metadata (None if missing)."""
+    svg_path = os.path.join(os.path.dirname(__file__), "assets", "svg", "KiwiAI.svg")
+    if not os.path.exists(svg_path):
+        return None
+    with open(svg_path, "r") as f:
+        svg_content = f.read()
+    return re.sub(r'\s+', ' ', _SVG_EDITOR_CRUFT.sub('', svg_content)).strip()
+
+
 def get_logo_svg(width="100%", height="auto", color="#00d9ff"):
     """Read and return the Kiwi AI logo SVG."""
     try:
-        svg_path = os.path.join(os.path.dirname(__file__), "assets", "svg", "KiwiAI.svg")
-        if os.path.exists(svg_path):
-            with open(svg_path, "r") as f:
-                svg_content = f.read()
-                # Inject width and height if needed, or wrap in a div
-                # For simplicity, we'll return it as is, but we might want to style it
-                return f'<div style="width: {width}; height: {height}; color: {color};">{svg_content}</div>'
+        svg_content = _logo_svg_markup()
+        if svg_content:
+            return f'<div style="width: {width}; height: {height}; color: {color};">{svg_content}</div>'
     except Exception as e:
         logger.logger.error(f"Error reading logo SVG: {e}")
     
     # Fallback if file not found
     return f'<div style="font-size: 40px;">🥝</div>'
 
-def get_tradingview_widget(symbol: str, height: int = 500) -> str:
-    """
-    Generate TradingView widget HTML for embedding.
-    
-    Args:
-        symbol: TradingView symbol (e.g., "NASDAQ:AAPL")
-        height: Height of the widget in pixels
-        
-    Returns:
-        HTML string for the TradingView widget
-    """
-    widget_html = f"""
+# TradingView embeddable chart widget
+_TV_WIDGET_TPL = Template("""
     <!-- TradingView Widget BEGIN -->
-    <div class="tradingview-widget-container" style="height:{height}px;width:100%">
-      <div id="tradingview_{symbol.replace(':', '_')}" style="height:100%;width:100%"></div>
+    <div class="tradingview-widget-container" style="height:${height}px;width:100%">
+      <div id="$container_id" style="height:100%;width:100%"></div>
       <script type="text/javascript" src="https://s3.tradingview.com/tv.js"></script>
       <script type="text/javascript">
       new TradingView.widget(
-      {{
+      {
         "width": "100%",
-        "height": {height},
-        "symbol": "{symbol}",
+        "height": $height,
+        "symbol": "$symbol",
         "interval": "D",
         "timezone": "America/New_York",
         "theme": "dark",
@@ -445,38 +385,127 @@ def get_tradingview_widget(symbol: str, height: int = 500) -> str:
         "toolbar_bg": "#f1f3f6",
         "enable_publishing": false,
         "allow_symbol_change": true,
-        "container_id": "tradingview_{symbol.replace(':', '_')}"
-      }});
+        "container_id": "$container_id"
+      });
       </script>
     </div>
     <!-- TradingView Widget END -->
-    """
-    return widget_html
-
+    """)
 
 
-def get_tradingview_mini_widget(symbol: str, width: str = "100%", height: int = 600) -> str:
+def get_tradingview_widget(symbol: str, height: int = 500) -> str:
     """
-    Generate TradingView advanced real-time chart widget.
+    Generate TradingView widget HTML for embedding.
     
     Args:
-        symbol: TradingView symbol
-        width: Width (e.g., "100%" or "500px")
-        height: Height in pixels
+        symbol: TradingView symbol (e.g., "NASDAQ:AAPL")
+        height: Height of the widget in pixels
         
     Returns:
-        HTML string for the widget
+        HTML string for the TradingView widget
+    """
+    container_id = f"tradingview_{symbol.replace(':', '_')}"
+    return _TV_WIDGET_TPL.substitute(container_id=container_id, height=height, symbol=symbol)
+
+
+
+# Candle colours for the embedded advanced chart
+_CHART_OVERRIDES = {
+    "mainSeriesProperties.candleStyle.upColor": "#00d9ff",
+    "mainSeriesProperties.candleStyle.downColor": "#ff4444",
+    "mainSeriesProperties.candleStyle.borderUpColor": "#00d9ff",
+    "mainSeriesProperties.candleStyle.borderDownColor": "#ff4444",
+    "mainSeriesProperties.candleStyle.wickUpColor": "#00d9ff",
+    "mainSeriesProperties.candleStyle.wickDownColor": "#ff4444"
+}
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _tradingview_chart_html(symbol, tv_style, studies, compare_symbols):
+    """
+    Build the embedded TradingView advanced chart document.
+    
+    Cached per symbol, style, studies and comparison symbols, so a rerun with an
+    unchanged toolbar reuses the document instead of reformatting it.
+    """
+    return f"""
+        <!DOCTYPE html>
+        <html style="margin: 0; padding: 0;">
+        <head>
+            <style>
+                * {{
+                    margin: 0;
+                    padding: 0;
+                    box-sizing: border-box;
+                }}
+                body {{
+                    background: transparent;
+                    min-height: 720px;
+                }}
+                .chart-wrapper {{
+                    width: 100%;
+                    height: 720px;
+                }}
+                .tradingview-widget-container {{
+                    width: 100%;
+                    height: 100%;
+                }}
+                #tradingview_chart {{
+                    width: 100%;
+                    height: 100%;
+                }}
+            </style>
+        </head>
+        <body>
+            <div class="chart-wrapper">
+                <div class="tradingview-widget-container">
+                  <div id="tradingview_chart"></div>
+                </div>
+            </div>
+            
+            <script type="text/javascript" src="https://s3.tradingview.com/tv.js"></script>
+            <script type="text/javascript">
+              new TradingView.widget({{
+                "autosize": true,
+                "symbol": "{symbol}",
+                "interval": "5",
+                "timezone": "America/New_York",
+                "theme": "dark",
+                "style": "{tv_style}",
+                "locale": "en",
+                "toolbar_bg": "#131722",
+                "enable_publishing": false,
+                "hide_top_toolbar": false,
+                "withdateranges": true,
+                "range": "1D",
+                "hide_side_toolbar": false,
+                "allow_symbol_change": true,
+                "details": true,
+                "hotlist": true,
+                "calendar": true,
+                "container_id": "tradingview_chart",
+                "studies": {json.dumps(list(studies))},
+                "compare_symbols": {json.dumps(list(compare_symbols))},
+                "overrides": {json.dumps(_CHART_OVERRIDES)}
+              }});
+            </script>
+        </body>
+        </html>
     """
-    widget_html = f"""
+
+
+
+# TradingView advanced real-time chart widget
+_TV_MINI_WIDGET_TPL = Template("""
     <!-- TradingView Widget BEGIN -->
-    <div class="tradingview-widget-container" style="height:{height}px;width:{width}">
-      <div id="tradingview_chart_{symbol.replace(':', '_')}" style="height:calc(100% - 32px);width:100%"></div>
+    <div class="tradingview-widget-container" style="height:${height}px;width:$width">
+      <div id="$container_id" style="height:calc(100% - 32px);width:100%"></div>
       <script type="text/javascript" src="https://s3.tradingview.com/tv.js"></script>
       <script type="text/javascript">
       new TradingView.widget(
-      {{
+      {
         "autosize": true,
-        "symbol": "{symbol}",
+        "symbol": "$symbol",
         "interval": "1",
         "timezone": "America/New_York",
         "theme": "dark",
@@ -512,19 +541,125 @@ def get_tradingview_mini_widget(symbol: str, width: str = "100%", height: int =
           "STD;EMA",
           "STD;RSI"
         ],
-        "container_id": "tradingview_chart_{symbol.replace(':', '_')}"
-      }});
+        "container_id": "$container_id"
+      });
       </script>
     </div>
     <!-- TradingView Widget END -->
+    """)
+
+
+def get_tradingview_mini_widget(symbol: str, width: str = "100%", height: int = 600) -> str:
+    """
+    Generate TradingView advanced real-time chart widget.
+    
+    Args:
+        symbol: TradingView symbol
+        width: Width (e.g., "100%" or "500px")
+        height: Height in pixels
+        
+    Returns:
+        HTML string for the widget
     """
-    return widget_html
+    container_id = f"tradingview_chart_{symbol.replace(':', '_')}"
+    return _TV_MINI_WIDGET_TPL.substitute(container_id=container_id, height=height, width=width, symbol=symbol)
 
 
 # ============================================================================
 # ERROR TRACKING & LOGGING
 # ============================================================================
 
+@dataclass(slots=True)
+class ErrorEntry:
+    """A single error or warning in the error log."""
+    timestamp: datetime
+    severity: str  # 'ERROR' or 'WARNING'
+    type: str
+    message: str
+    exception: Optional[str] = None
+    context: Optional[dict] = None
+    traceback_z: Optional[bytes] = None  # zlib-compressed; read through .traceback
+    _context_json: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    
+    @property
+    def traceback(self) -> Optional[str]:
+        """The formatted traceback, decompressed on demand."""
+        return zlib.decompress(self.traceback_z).decode() if self.traceback_z else None
+    
+    @property
+    def context_json(self) -> Optional[str]:
+        """The context as indented JSON, serialized on first use and kept."""
+        if self._context_json is None and self.context:
+            self._context_json = _dumps_indented(self.context)
+        return self._context_json
+    
+    def __getitem__(self, key):
+        """Allow entry['field'] access for code written against the old dict entries."""
+        return getattr(self, key)
+    
+    def to_dict(self) -> dict:
+        """Return the entry as a plain dict, traceback included as text."""
+        entry = {name: getattr(self, name) for name in _ERROR_FIELDS}
+        entry['traceback'] = self.traceback
+        return entry
+
+
+def _dumps_indented(obj) -> str:
+    """Serialize obj as indented JSON, with orjson when it is installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS, default=str).decode()
+    return json.dumps(obj, indent=2, default=str)
+
+
+# Severity levels an error log entry can have
+_SEVERITY_LEVELS = ['ERROR', 'WARNING']
+
+# Error entry fields shown in tables, and a getter returning them as a row tuple
+_ERROR_FIELDS = [f.name for f in fields(ErrorEntry) if f.init and f.name != 'traceback_z']
+_error_row = attrgetter(*_ERROR_FIELDS)
+
+
+def _append_error_entry(entry: ErrorEntry):
+    """Prepend an entry to the bounded error log, update its counts, and bump the log version."""
+    error_log = trading_state.error_log
+    error_types = trading_state.error_types
+    error_severities = trading_state.error_severities
+    
+    # A full deque drops its oldest (rightmost) entry on appendleft
+    if len(error_log) == error_log.maxlen:
+        evicted = error_log[-1]
+        _forget_count(error_types, evicted.type)
+        _forget_count(error_severities, evicted.severity)
+    error_log.appendleft(entry)
+    error_types[entry.type] += 1
+    error_severities[entry.severity] += 1
+    
+    trading_state.error_log_version += 1
+    
+    # Archive every entry on disk; the in-memory log is only the recent window
+    try:
+        get_error_store().add(entry.timestamp, entry.severity, entry.type, entry.message,
+                              entry.exception, entry.context, entry.traceback_z)
+    except Exception as e:
+        logger.logger.warning(f"Could not archive error log entry: {e}")
+
+
+def _forget_count(counts: Counter, key: str):
+    """Count one evicted entry out of counts, dropping keys with none left."""
+    counts[key] -= 1
+    if counts[key] <= 0:
+        del counts[key]
+
+
+def resize_error_log(maxlen: int):
+    """Change the error log capacity, keeping the newest entries that still fit."""
+    error_log = deque(islice(trading_state.error_log, maxlen), maxlen=maxlen)
+    trading_state.error_log = error_log
+    trading_state.error_types = Counter(e.type for e in error_log)
+    trading_state.error_severities = Counter(e.severity for e in error_log)
+    trading_state.error_log_version += 1
+
+
 def log_error(error_type: str, message: str, exception: Exception = None, context: dict = None):
     """
     Log errors with full context for debugging.
@@ -537,64 +672,107 @@ def log_error(error_type: str, message: str, exception: Exception = None, contex
     """
     import traceback
     
-    error_entry = {
-        'timestamp': datetime.now(),
-        'type': error_type,
-        'message': message,
-        'exception': str(exception) if exception else None,
-        'traceback': traceback.format_exc() if exception else None,
-        'context': context or {},
-        'severity': 'ERROR'
-    }
+    # Formatted once, for both the error log entry and the log file
+    tb = traceback.format_exc() if exception else None
+    
+    error_entry = ErrorEntry(
+        timestamp=datetime.now(),
+        severity='ERROR',
+        type=error_type,
+        message=message,
+        exception=str(exception) if exception else None,
+        context=context or {},
+        traceback_z=zlib.compress(tb.encode()) if tb else None
+    )
     
     # Add to global error log
-    trading_state.error_log.insert(0, error_entry)
-    
-    # Keep only last 100 errors
-    if len(trading_state.error_log) > 100:
-        trading_state.error_log = trading_state.error_log[:100]
+    _append_error_entry(error_entry)
     
     # Log to file
-    logger.logger.error(f"[{error_type}] {message}")
+    logger.logger.error("[%s] %s", error_type, message)
     if exception:
-        logger.logger.error(f"Exception: {exception}")
-        logger.logger.error(f"Traceback:\n{traceback.format_exc()}")
+        logger.logger.error("Exception: %s", exception)
+        logger.logger.error("Traceback:\n%s", tb)
     if context:
-        logger.logger.error(f"Context: {context}")
+        logger.logger.error("Context: %s", context)
     
     return error_entry
 
 
 def log_warning(warning_type: str, message: str, context: dict = None):
     """Log warnings (non-critical issues)."""
-    warning_entry = {
-        'timestamp': datetime.now(),
-        'type': warning_type,
-        'message': message,
-        'exception': None,
-        'traceback': None,
-        'context': context or {},
-        'severity': 'WARNING'
-    }
-    
-    trading_state.error_log.insert(0, warning_entry)
+    warning_entry = ErrorEntry(
+        timestamp=datetime.now(),
+        severity='WARNING',
+        type=warning_type,
+        message=message,
+        context=context or {}
+    )
     
-    if len(trading_state.error_log) > 100:
-        trading_state.error_log = trading_state.error_log[:100]
+    _append_error_entry(warning_entry)
     
-    logger.logger.warning(f"[{warning_type}] {message}")
+    logger.logger.warning("[%s] %s", warning_type, message)
     if context:
-        logger.logger.warning(f"Context: {context}")
+        logger.logger.warning("Context: %s", context)
     
     return warning_entry
 
 
 def clear_error_log():
     """Clear all errors from the log."""
-    trading_state.error_log = []
+    trading_state.error_log.clear()
+    trading_state.error_types.clear()
+    trading_state.error_severities.clear()
+    trading_state.error_log_version += 1
     logger.logger.info("Error log cleared")
 
 
+def _error_log_frame():
+    """Return the error log as a DataFrame with formatted display columns, rebuilt only when the log changes."""
+    error_log_version = trading_state.error_log_version
+    if st.session_state.get('error_frame_v') != error_log_version:
+        frame = pd.DataFrame.from_records(list(map(_error_row, trading_state.error_log)), columns=_ERROR_FIELDS)
+        frame['timestamp'] = pd.to_datetime(frame['timestamp'])
+        message = frame['message'].astype(str)
+        frame['time_str'] = frame['timestamp'].dt.strftime('%H:%M:%S')
+        frame['msg_short'] = message.str.slice(0, 50) + np.where(message.str.len() > 50, '...', '')
+        st.session_state.error_frame = frame
+        st.session_state.error_frame_v = error_log_version
+    return st.session_state.error_frame
+
+
+def _error_log_view(severity_filter, type_filter):
+    """
+    Return (filtered_errors, type_counts, severity_counts) for the Error Log page.
+    
+    The counts are maintained as entries are logged, so only the filtered view needs
+    a pass over the log; it is reused until the log or the filter selection changes.
+    """
+    view_key = (trading_state.error_log_version, tuple(sorted(severity_filter)), tuple(sorted(type_filter)))
+    if st.session_state.get('error_view_key') == view_key:
+        return st.session_state.error_view
+    
+    error_log = trading_state.error_log
+    severity_set = set(severity_filter)
+    type_set = set(type_filter)
+    type_counts = Counter(trading_state.error_types)
+    severity_counts = Counter(trading_state.error_severities)
+    
+    if severity_set.issuperset(_SEVERITY_LEVELS) and (not type_set or type_set >= type_counts.keys()):
+        # Nothing to filter out when every severity and type in the log is selected
+        filtered_errors = list(error_log)
+    elif type_set and 2 * sum(type_counts[t] for t in type_set) < len(error_log):
+        # Test the more selective filter first, so most rejected entries stop at one check
+        filtered_errors = [e for e in error_log if e.type in type_set and e.severity in severity_set]
+    else:
+        filtered_errors = [e for e in error_log
+                           if e.severity in severity_set and (not type_set or e.type in type_set)]
+    
+    st.session_state.error_view = (filtered_errors, type_counts, severity_counts)
+    st.session_state.error_view_key = view_key
+    return st.session_state.error_view
+
+
 # ============================================================================
 # CONFIGURATION MANAGEMENT
 # ============================================================================
@@ -637,6 +815,7 @@ def save_settings(settings):
     """Save settings to session state and config file."""
     try:
         st.session_state.settings = settings
+        st.session_state.pop('risk_manager', None)  # Rebuilt with the new limits on next use
         
         # Update config module
         config.ALPACA_KEY = settings['alpaca_key']
@@ -651,21 +830,37 @@ def save_settings(settings):
         # Try to save to .env file
         try:
             env_path = os.path.join(os.path.dirname(__file__), '.env')
-            env_content = f"""# Kiwi AI Configuration
-# Broker API Keys
-ALPACA_API_KEY={settings['alpaca_key']}
-ALPACA_SECRET_KEY={settings['alpaca_secret']}
-ALPACA_PAPER_TRADING={str(settings['is_paper_trading']).lower()}
-
-# Trading Parameters
-INITIAL_CAPITAL={settings['initial_capital']}
-MAX_RISK_PER_TRADE={settings['max_risk_per_trade']}
-MAX_POSITION_SIZE={settings['max_position_size']}
-TRADING_SYMBOL={settings['trading_symbol']}
-TRADING_INTERVAL={settings['check_interval']}
-"""
-            with open(env_path, 'w') as f:
-                f.write(env_content)
+            env_lines = [
+                "# Kiwi AI Configuration\n",
+                "# Broker API Keys\n",
+                f"ALPACA_API_KEY={settings['alpaca_key']}\n",
+                f"ALPACA_SECRET_KEY={settings['alpaca_secret']}\n",
+                f"ALPACA_PAPER_TRADING={str(settings['is_paper_trading']).lower()}\n",
+                "\n",
+                "# Trading Parameters\n",
+                f"INITIAL_CAPITAL={settings['initial_capital']}\n",
+                f"MAX_RISK_PER_TRADE={settings['max_risk_per_trade']}\n",
+                f"MAX_POSITION_SIZE={settings['max_position_size']}\n",
+                f"TRADING_SYMBOL={settings['trading_symbol']}\n",
+                f"TRADING_INTERVAL={settings['check_interval']}\n"
+            ]
+            # Skip the write when the file on disk already holds identical content
+            if os.path.exists(env_path):
+                with open(env_path) as f:
+                    if f.readlines() == env_lines:
+                        return
+            # Write a uniquely named sibling temp file, flush it to disk, then swap it in,
+            # so a crash never leaves a partial .env and concurrent saves never share a temp file
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(env_path), prefix='.env.', suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    f.writelines(env_lines)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, env_path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
             logger.logger.info("Settings saved to .env file successfully")
         except Exception as e:
             log_warning('Configuration', 'Could not save to .env file', {
@@ -689,10 +884,74 @@ def check_configuration():
     return True
 
 
+def get_session_risk_manager(settings):
+    """Return the session's RiskManager, rebuilding it only when the risk settings change."""
+    key = (settings['initial_capital'], settings['max_risk_per_trade'])
+    cached = st.session_state.get('risk_manager')
+    if cached is None or st.session_state.get('risk_manager_key') != key:
+        cached = RiskManager(
+            initial_capital=settings['initial_capital'],
+            max_risk_per_trade=settings['max_risk_per_trade']
+        )
+        st.session_state.risk_manager = cached
+        st.session_state.risk_manager_key = key
+    return cached
+
+
 # ============================================================================
 # TRADING LOGIC - DAILY MODE
 # ============================================================================
 
+# Seconds a fetched history window is reused before asking the data source again
+_HISTORY_TTL_SECONDS = 60
+
+# Bar columns narrowed to float32 for the indicator code (~7 significant digits,
+# well beyond the precision of the price-level thresholds it applies)
+_OHLCV_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+
+@st.cache_data(ttl=_HISTORY_TTL_SECONDS, max_entries=32, show_spinner=False)
+def _cached_history(symbol, start_date, end_date, timeframe):
+    """Fetch a historical bar window, shared across loop iterations until the TTL lapses."""
+    data = DataHandler().fetch_historical_data(
+        symbol=symbol,
+        start_date=start_date,
+        end_date=end_date,
+        timeframe=timeframe
+    )
+    if data is not None:
+        data = data.astype({col: np.float32 for col in _OHLCV_COLUMNS if col in data.columns}, copy=False)
+    return data
+
+
+@st.cache_resource(show_spinner=False)
+def _get_regime_detector():
+    """
+    Get the process-wide regime detector, loading its model and compiling its
+    kernel once.
+
+    The detector only reads its model while predicting, so trading threads can
+    share it. Brokers, strategies and monitors keep per-run state and are
+    still built for each run.
+    """
+    regime_detector = RegimeDetector()
+    regime_detector.warm_up()
+    return regime_detector
+
+
+def _build_strategies():
+    """Create a fresh set of trading strategies, importing them on first use."""
+    from strategies.trend_following import TrendFollowingStrategy
+    from strategies.mean_reversion import MeanReversionStrategy
+    from strategies.volatility_breakout import VolatilityBreakoutStrategy
+    
+    return [
+        TrendFollowingStrategy(),
+        MeanReversionStrategy(),
+        VolatilityBreakoutStrategy()
+    ]
+
+
 class KiwiAI:
     """Main Kiwi AI trading system for daily mode."""
     
@@ -712,22 +971,18 @@ class KiwiAI:
         self.current_regime = None
         self.current_strategy_name = None
         self.position = None
+        self._date_cache = (None, None, None)  # (today, start_str, end_str) of the history window
+        self._stop_event = trading_state.stop_event
         
         logger.logger.info("✅ Kiwi AI initialized successfully!")
     
     def _initialize_components(self):
         """Initialize all system components."""
         self.data_handler = DataHandler()
-        self.regime_detector = RegimeDetector()
+        self.regime_detector = _get_regime_detector()
         self.performance_monitor = PerformanceMonitor()
         
-        strategy_list = [
-            TrendFollowingStrategy(),
-            MeanReversionStrategy(),
-            VolatilityBreakoutStrategy()
-        ]
-        
-        self.strategy_selector = StrategySelector(strategy_list, self.regime_detector)
+        self.strategy_selector = StrategySelector(_build_strategies(), self.regime_detector)
         self.strategies = self.strategy_selector.strategies
         
         self.broker = Broker(
@@ -754,11 +1009,18 @@ class KiwiAI:
                 loop_start = datetime.now()
                 logger.logger.info(f"\n{'='*80}\n📊 Trading Loop | {loop_start.strftime('%Y-%m-%d %H:%M:%S')}\n{'='*80}")
                 
-                self._execute_trading_logic()
+                # Broker snapshot this pass trades against - fetched once, right before trading
+                account = self.broker.get_account_info()
+                positions = self.broker.get_open_positions()
+                
+                if self._execute_trading_logic(account, frozenset(pos['symbol'] for pos in positions)):
+                    # An order went through, so the snapshot predates it - fetch the result
+                    account = self.broker.get_account_info()
+                    positions = self.broker.get_open_positions()
+                trading_state.account = account
+                trading_state.positions = positions
                 
                 # Update state
-                trading_state.account = self.broker.get_account_info()
-                trading_state.positions = self.broker.get_open_positions()
                 trading_state.current_regime = self.current_regime or "Unknown"
                 trading_state.current_strategy = self.current_strategy_name or "None"
                 
@@ -767,7 +1029,8 @@ class KiwiAI:
                 sleep_time = max(0, (self.interval_minutes * 60) - elapsed)
                 
                 logger.logger.info(f"⏰ Next check in {sleep_time/60:.1f} minutes")
-                time.sleep(min(sleep_time, 10))  # Check every 10 seconds for stop signal
+                if self._stop_event.wait(timeout=sleep_time):  # Returns early once stop is requested
+                    break
                 
             except Exception as e:
                 log_error('Trading Loop', 'Error in daily trading loop', e, {
@@ -777,26 +1040,33 @@ class KiwiAI:
                     'current_regime': self.current_regime,
                     'current_strategy': self.current_strategy_name
                 })
-                time.sleep(60)
+                if self._stop_event.wait(timeout=60):
+                    break
         
         self._shutdown()
     
-    def _execute_trading_logic(self):
-        """Execute one iteration of trading logic."""
-        # Fetch data
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=365)
+    def _execute_trading_logic(self, account: dict, open_symbols: frozenset) -> bool:
+        """
+        Execute one iteration of trading logic.
         
-        data = self.data_handler.fetch_historical_data(
-            symbol=self.symbol,
-            start_date=start_date.strftime('%Y-%m-%d'),
-            end_date=end_date.strftime('%Y-%m-%d'),
-            timeframe="1D"
-        )
+        Args:
+            account: Latest account snapshot from the broker
+            open_symbols: Symbols with an open position in that snapshot
+            
+        Returns:
+            True if an order was submitted
+        """
+        # Fetch data - the one-year window only moves when the date changes
+        today = date.today()
+        if today != self._date_cache[0]:
+            self._date_cache = (today, (today - timedelta(days=365)).isoformat(), today.isoformat())
+        _, start_str, end_str = self._date_cache
+        
+        data = _cached_history(self.symbol, start_str, end_str, "1D")
         
         if data is None or len(data) < 50:
             logger.logger.warning("⚠️  Insufficient data")
-            return
+            return False
         
         # Detect regime
         regime = self.regime_detector.predict_regime(data)
@@ -819,22 +1089,19 @@ class KiwiAI:
         signal = selected_strategy.generate_signals(data)
         
         if signal is None or len(signal) == 0:
-            return
+            return False
         
         latest_signal = signal.iloc[-1]
         logger.logger.info(f"📊 Signal: {latest_signal}")
         
         # Execute trade
-        self._execute_trade(latest_signal, data)
+        return self._execute_trade(latest_signal, data, account, open_symbols)
     
-    def _execute_trade(self, signal: int, data):
-        """Execute trade based on signal."""
+    def _execute_trade(self, signal: int, data, account: dict, open_symbols: frozenset) -> bool:
+        """Execute trade based on signal, against the loop's broker snapshot; True if an order went through."""
         try:
             current_price = data['close'].iloc[-1]
-            account = self.broker.get_account_info()
-            positions = self.broker.get_open_positions()
-            
-            has_position = any(pos['symbol'] == self.symbol for pos in positions)
+            has_position = self.symbol in open_symbols
             
             if signal == 1 and not has_position:  # BUY
                 logger.logger.info("📈 BUY signal")
@@ -847,13 +1114,16 @@ class KiwiAI:
                         result = self.broker.place_order(self.symbol, qty, 'buy', 'market')
                         if result.get('success'):
                             logger.logger.info(f"✅ BUY order: {qty} shares @ ${current_price:.2f}")
-                            trading_state.recent_trades.insert(0, {
-                                'time': datetime.now(),
+                            now = datetime.now()
+                            trading_state.recent_trades.appendleft({
+                                'time': now,
+                                'time_str': now.strftime('%H:%M'),
                                 'symbol': self.symbol,
                                 'action': 'BUY',
                                 'qty': qty,
                                 'price': current_price
                             })
+                            return True
                         else:
                             log_error('Order Execution', 'BUY order failed', None, {
                                 'symbol': self.symbol,
@@ -881,13 +1151,16 @@ class KiwiAI:
                     result = self.broker.close_position(self.symbol)
                     if result.get('success'):
                         logger.logger.info("✅ Position closed")
-                        trading_state.recent_trades.insert(0, {
-                            'time': datetime.now(),
+                        now = datetime.now()
+                        trading_state.recent_trades.appendleft({
+                            'time': now,
+                            'time_str': now.strftime('%H:%M'),
                             'symbol': self.symbol,
                             'action': 'SELL',
                             'qty': 0,
                             'price': current_price
                         })
+                        return True
                     else:
                         log_error('Order Execution', 'SELL order failed', None, {
                             'symbol': self.symbol,
@@ -904,6 +1177,7 @@ class KiwiAI:
                 'symbol': self.symbol,
                 'signal': signal
             })
+        return False
     
     def _shutdown(self):
         """Graceful shutdown."""
@@ -918,8 +1192,20 @@ class KiwiAI:
 # TRADING LOGIC - REAL-TIME MODE
 # ============================================================================
 
-def run_realtime_trading(settings: dict):
-    """Run real-time trading mode."""
+# Bars kept per symbol for live analysis
+_BAR_HISTORY_MAXLEN = 500
+# Longest wait (seconds) for a stopped stream's thread to exit before reconnecting
+_STREAM_CLOSE_TIMEOUT = 10
+
+
+def run_realtime_trading(settings: dict, previous_thread: Optional[threading.Thread] = None):
+    """
+    Run real-time trading mode.
+
+    Args:
+        settings: Trading settings
+        previous_thread: Thread of the last (stopped) session, waited on before connecting
+    """
     if not REALTIME_AVAILABLE:
         logger.logger.error("❌ Real-time mode requires alpaca-trade-api")
         return
@@ -942,17 +1228,11 @@ def run_realtime_trading(settings: dict):
         max_risk_per_trade=settings['max_risk_per_trade']
     )
     
-    regime_detector = RegimeDetector()
+    regime_detector = _get_regime_detector()
     performance_monitor = PerformanceMonitor()
     data_handler = DataHandler()
     
-    strategy_list = [
-        TrendFollowingStrategy(),
-        MeanReversionStrategy(),
-        VolatilityBreakoutStrategy()
-    ]
-    
-    strategy_selector = StrategySelector(strategy_list, regime_detector)
+    strategy_selector = StrategySelector(_build_strategies(), regime_detector)
     
     trading_state.broker = broker
     
@@ -964,7 +1244,7 @@ def run_realtime_trading(settings: dict):
     logger.logger.info("🧠 AI Intelligence initialized - waiting for market data...")
     
     # Track data
-    bar_history = {symbol: deque(maxlen=500) for symbol in symbols}
+    bar_history = {symbol: BarRing(_BAR_HISTORY_MAXLEN) for symbol in symbols}
     positions = {}
     last_signal_time = {}
 
@@ -979,10 +1259,11 @@ def run_realtime_trading(settings: dict):
             timeframe=timeframe
         )
         if hist_data is not None and not hist_data.empty:
-            # Convert to list of dicts
-            hist_data.reset_index(inplace=True)
-            trading_state.bar_history = hist_data.to_dict('records')
-            logger.logger.info(f"Pre-filled bar history with {len(trading_state.bar_history)} bars.")
+            ring = BarRing(_BAR_HISTORY_MAXLEN)
+            ring.extend(hist_data)
+            trading_state.bar_history = {settings['trading_symbol']: ring}
+            trading_state.bar_count += len(ring)
+            logger.logger.info(f"Pre-filled bar history with {len(ring)} bars.")
     except Exception as e:
         logger.logger.error(f"Could not pre-fill bar history: {e}")
 
@@ -1000,15 +1281,21 @@ def run_realtime_trading(settings: dict):
             try:
                 logger.logger.info("🔌 Closing existing WebSocket connection...")
                 trading_state.stream.stop()
-                time.sleep(3)  # Give more time to properly close
                 trading_state.stream = None
                 logger.logger.info("✅ Existing connection closed")
             except Exception as e:
                 logger.logger.warning(f"Warning closing old stream: {e}")
                 trading_state.stream = None
         
-        # Wait a bit to ensure connection is fully closed
-        time.sleep(2)
+        # Alpaca allows one stream connection per account - wait until the previous
+        # session's thread has exited (its stream.run() returns once the socket is closed)
+        if previous_thread is not None and previous_thread.is_alive():
+            logger.logger.info("⏳ Waiting for the previous connection to close...")
+            previous_thread.join(timeout=_STREAM_CLOSE_TIMEOUT)
+            if previous_thread.is_alive():
+                logger.logger.warning("Previous connection still closing - connecting anyway")
+        
+        import alpaca_trade_api as tradeapi
         
         # Initialize WebSocket with retry logic
         max_retries = 3
@@ -1060,20 +1347,16 @@ def run_realtime_trading(settings: dict):
         
         symbol = bar.symbol
         
-        bar_data = {
-            'timestamp': bar.timestamp,
-            'open': bar.open,
-            'high': bar.high,
-            'low': bar.low,
-            'close': bar.close,
-            'volume': bar.volume
-        }
-        bar_history[symbol].append(bar_data)
+        bar_values = (bar.timestamp, bar.open, bar.high, bar.low, bar.close, bar.volume)
+        bar_history[symbol].append(*bar_values)
         
         # Update trading_state bar history
-        new_bar_history = trading_state.bar_history
-        new_bar_history.append(bar_data)
-        trading_state.bar_history = new_bar_history
+        shared_history = trading_state.bar_history
+        ring = shared_history.get(symbol)
+        if ring is None:
+            ring = shared_history[symbol] = BarRing(_BAR_HISTORY_MAXLEN)
+        ring.append(*bar_values)
+        trading_state.bar_count += 1
 
 
         logger.logger.info(f"📊 {symbol}: ${bar.close:.2f}")
@@ -1098,8 +1381,7 @@ def run_realtime_trading(settings: dict):
                 return
 
         try:
-            df = pd.DataFrame(list(bar_history[symbol]))
-            df.set_index('timestamp', inplace=True)
+            df = bar_history[symbol].as_dataframe()
 
             # Detect market regime
             regime = regime_detector.predict_regime(df)
@@ -1322,8 +1604,7 @@ You'll receive instant alerts when strong trading signals are detected.
         try:
             if stream is not None:
                 logger.logger.info("🔌 Stopping stream...")
-                stream.stop()
-                time.sleep(2)
+                stream.stop()  # stream.run() has returned, so this only releases what is left
                 logger.logger.info("✅ Stream stopped cleanly")
         except Exception as e:
             logger.logger.warning(f"Error stopping stream: {e}")
@@ -1332,47 +1613,1119 @@ You'll receive instant alerts when strong trading signals are detected.
         trading_state.stream = None
         trading_state.connecting = False
         logger.logger.info("✅ Connection cleanup complete")
-        time.sleep(2)  # Give time for cleanup
 
 
 # ============================================================================
 # STREAMLIT DASHBOARD
 # ============================================================================
 
-def show_settings_page():
-    """Display settings configuration page."""
-    st.markdown(f'<h1>{get_iconly_icon("Setting", 24, "#00d9ff")} Settings</h1>', unsafe_allow_html=True)
-    
-    settings = load_settings()
-    
-    with st.form("settings_form"):
-        st.subheader("� Alpaca API Configuration")
-        st.markdown("Get your free API keys at [alpaca.markets](https://alpaca.markets/)")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            alpaca_key = st.text_input(
-                "API Key",
-                value=settings['alpaca_key'],
-                type="password",
-                help="Your Alpaca API key"
-            )
-        
-        with col2:
-            alpaca_secret = st.text_input(
-                "Secret Key",
-                value=settings['alpaca_secret'],
-                type="password",
-                help="Your Alpaca secret key"
-            )
-        
-        is_paper = st.checkbox(
-            "📄 Use Paper Trading (Recommended)",
-            value=settings['is_paper_trading'],
-            help="Paper trading uses fake money for testing. Uncheck for real money trading."
-        )
-        
+# Detail panel templates - compiled once at import, substituted per render
+_ASSET_HEADER_TPL = Template("""
+<div style='color: #00d9ff; font-size: 18px; font-weight: 700; margin-bottom: 20px; text-align: center;'>
+    📊 Asset Overview: $selected_symbol
+</div>
+""")
+
+_ASSET_TABLE_TPL = Template("""
+<div class='kiwi-card kiwi-card--cyan'>
+    <p style='color: #00d9ff; font-size: 14px; font-weight: 600; margin: 0 0 10px 0;'>📋 ASSET DETAILS</p>
+    <table style='width: 100%; color: #ffffff;'>
+        <tr style='border-bottom: 1px solid rgba(255,255,255,0.1);'>
+            <td style='padding: 8px 0; color: #888;'>Symbol:</td>
+            <td style='padding: 8px 0; text-align: right; font-weight: 600;'>$selected_symbol</td>
+        </tr>
+        <tr style='border-bottom: 1px solid rgba(255,255,255,0.1);'>
+            <td style='padding: 8px 0; color: #888;'>Name:</td>
+            <td style='padding: 8px 0; text-align: right; font-weight: 600;'>$selected_asset_name</td>
+        </tr>
+        <tr style='border-bottom: 1px solid rgba(255,255,255,0.1);'>
+            <td style='padding: 8px 0; color: #888;'>Category:</td>
+            <td style='padding: 8px 0; text-align: right; font-weight: 600;'>$asset_category</td>
+        </tr>
+        <tr>
+            <td style='padding: 8px 0; color: #888;'>Exchange:</td>
+            <td style='padding: 8px 0; text-align: right; font-weight: 600;'>${exchange}</td>
+        </tr>
+    </table>
+</div>
+""")
+
+_ASSET_PERFORMANCE_TPL = Template("""
+<div class='kiwi-card kiwi-card--green'>
+    <p style='color: #4caf50; font-size: 14px; font-weight: 600; margin: 0 0 10px 0;'>📈 MARKET PERFORMANCE</p>
+    <p style='color: #ffffff; margin: 10px 0; font-size: 13px;'>Access comprehensive market data and live performance metrics:</p>
+    <a href='$finance_url' 
+       target='_blank' 
+       style='display: inline-block; background: linear-gradient(135deg, #4caf50, #45a049); 
+              color: white; padding: 10px 20px; border-radius: 6px; text-decoration: none; 
+              font-weight: 600; font-size: 13px; margin-top: 10px;'>
+        🔗 View on Google Finance
+    </a>
+</div>
+""")
+
+_FINANCE_URL_TPL = Template("https://www.google.com/finance/quote/$symbol:$market")
+
+# Google Finance exchange per asset category; anything not listed is quoted as an index
+_MARKET_BY_CATEGORY = {'Stocks': 'NASDAQ'}.get
+
+
+@lru_cache(maxsize=128)
+def _finance_url(symbol, market):
+    """Build the Google Finance quote URL, URL-encoding the symbol once per pair."""
+    return _FINANCE_URL_TPL.substitute(symbol=quote(symbol, safe=''), market=market)
+
+
+_ASSET_WHY_TPL = Template("""
+<div class='kiwi-card kiwi-card--orange kiwi-card--mt'>
+    <p style='color: #ff9800; font-size: 14px; font-weight: 600; margin: 0 0 10px 0;'>💡 WHY THIS ASSET?</p>
+    <p style='color: #ffffff; margin: 0; font-size: 13px; line-height: 1.6;'>
+        <strong>$selected_symbol</strong> was selected based on your configuration settings. 
+        The AI continuously monitors price action, trading volume, and multiple technical indicators 
+        to identify optimal entry and exit opportunities. This asset is being analyzed in real-time 
+        to detect high-probability trading setups that align with current market conditions.
+    </p>
+</div>
+""")
+
+_ASSET_ANALYSIS_STATUS_HTML = """
+<div class='kiwi-card kiwi-card--blue kiwi-card--mt'>
+    <p style='color: #2196f3; font-size: 14px; font-weight: 600; margin: 0 0 10px 0;'>🤖 AI ANALYSIS STATUS</p>
+    <div style='display: grid; grid-template-columns: repeat(3, 1fr); gap: 1rem;'>
+        <div style='text-align: center; padding: 10px;'>
+            <div style='font-size: 24px; margin-bottom: 5px;'>✅</div>
+            <div style='color: #4caf50; font-weight: 600; font-size: 12px;'>Price Tracking</div>
+            <div style='color: #888; font-size: 11px;'>Real-time</div>
+        </div>
+        <div style='text-align: center; padding: 10px;'>
+            <div style='font-size: 24px; margin-bottom: 5px;'>✅</div>
+            <div style='color: #4caf50; font-weight: 600; font-size: 12px;'>Technical Indicators</div>
+            <div style='color: #888; font-size: 11px;'>Active</div>
+        </div>
+        <div style='text-align: center; padding: 10px;'>
+            <div style='font-size: 24px; margin-bottom: 5px;'>✅</div>
+            <div style='color: #4caf50; font-weight: 600; font-size: 12px;'>Volume Analysis</div>
+            <div style='color: #888; font-size: 11px;'>Monitoring</div>
+        </div>
+    </div>
+</div>
+"""
+
+_REGIME_HEADER_TPL = Template("""
+<div style='color: #4cafff; font-size: 18px; font-weight: 700; margin-bottom: 20px; text-align: center;'>
+    🌊 Market Regime Analysis: $regime_icon $regime_display
+</div>
+""")
+
+_REGIME_OVERVIEW_TPL = Template("""
+<div class='kiwi-card kiwi-card--sky kiwi-card--lg kiwi-card--mb'>
+    <p style='color: #4cafff; font-size: 16px; font-weight: 600; margin: 0 0 10px 0; text-align: center;'>
+        $regime_icon Current Market Condition
+    </p>
+    <p style='color: #ffffff; margin: 0; font-size: 14px; text-align: center; line-height: 1.6;'>
+        $description
+    </p>
+</div>
+""")
+
+_REGIME_CHARACTERISTICS_TPL = Template("""
+<div class='kiwi-card kiwi-card--blue kiwi-card--fill'>
+    <p style='color: #2196f3; font-size: 14px; font-weight: 600; margin: 0 0 10px 0;'>📋 KEY CHARACTERISTICS</p>
+    <div style='color: #ffffff; font-size: 13px; line-height: 1.8;'>
+        $characteristics_html
+    </div>
+</div>
+""")
+
+_REGIME_STRATEGY_TPL = Template("""
+<div class='kiwi-card kiwi-card--green kiwi-card--fill'>
+    <p style='color: #4caf50; font-size: 14px; font-weight: 600; margin: 0 0 10px 0;'>🎯 OPTIMAL STRATEGY</p>
+    <p style='color: #ffffff; margin: 0; font-size: 13px; line-height: 1.8;'>
+        $best_for
+    </p>
+</div>
+""")
+
+_REGIME_RISK_TPL = Template("""
+<div class='kiwi-card kiwi-card--orange kiwi-card--mt'>
+    <p style='color: #ff9800; font-size: 14px; font-weight: 600; margin: 0 0 10px 0;'>⚠️ RISK ASSESSMENT</p>
+    <p style='color: $risk_color; margin: 0; font-size: 14px; font-weight: 600;'>
+        $risk
+    </p>
+</div>
+""")
+
+_REGIME_DETECTION_HTML = """
+<div class='kiwi-card kiwi-card--purple kiwi-card--mt'>
+    <p style='color: #9c27b0; font-size: 14px; font-weight: 600; margin: 0 0 10px 0;'>🤖 AI DETECTION METHOD</p>
+    <p style='color: #ffffff; margin: 0; font-size: 13px; line-height: 1.6;'>
+        The AI uses machine learning algorithms to analyze price patterns, volatility, and momentum 
+        to classify market conditions in real-time. This enables automatic strategy selection 
+        that adapts to changing market dynamics.
+    </p>
+</div>
+"""
+
+_STRATEGY_HEADER_TPL = Template("""
+<div style='color: #ffc107; font-size: 18px; font-weight: 700; margin-bottom: 20px; text-align: center;'>
+    🎯 Strategy Deep Dive: $strategy_display
+</div>
+""")
+
+_STRATEGY_OVERVIEW_TPL = Template("""
+<div class='kiwi-card kiwi-card--amber kiwi-card--lg kiwi-card--mb'>
+    <p style='color: #ffc107; font-size: 16px; font-weight: 600; margin: 0 0 10px 0; text-align: center;'>
+        💡 Strategy Overview
+    </p>
+    <p style='color: #ffffff; margin: 0; font-size: 14px; text-align: center; line-height: 1.6;'>
+        $description
+    </p>
+</div>
+""")
+
+_STRATEGY_LOGIC_TPL = Template("""
+<div class='kiwi-card kiwi-card--blue kiwi-card--mb'>
+    <p style='color: #2196f3; font-size: 14px; font-weight: 600; margin: 0 0 10px 0;'>🔍 HOW IT WORKS</p>
+    <p style='color: #ffffff; margin: 0; font-size: 13px; line-height: 1.6;'>
+        $logic
+    </p>
+</div>
+""")
+
+_STRATEGY_INDICATORS_TPL = Template("""
+<div class='kiwi-card kiwi-card--purple kiwi-card--mb'>
+    <p style='color: #9c27b0; font-size: 14px; font-weight: 600; margin: 0 0 10px 0;'>� KEY INDICATORS</p>
+    <div style='color: #ffffff; font-size: 13px; line-height: 1.8;'>
+        $indicators_html
+    </div>
+</div>
+""")
+
+_STRATEGY_ENTRY_TPL = Template("""
+<div class='kiwi-card kiwi-card--green kiwi-card--fill'>
+    <p style='color: #4caf50; font-size: 14px; font-weight: 600; margin: 0 0 10px 0;'>🟢 ENTRY CONDITIONS</p>
+    <p style='color: #ffffff; margin: 0; font-size: 13px; line-height: 1.6;'>
+        $entry
+    </p>
+</div>
+""")
+
+_STRATEGY_EXIT_TPL = Template("""
+<div class='kiwi-card kiwi-card--red kiwi-card--fill'>
+    <p style='color: #f44336; font-size: 14px; font-weight: 600; margin: 0 0 10px 0;'>🔴 EXIT CONDITIONS</p>
+    <p style='color: #ffffff; margin: 0; font-size: 13px; line-height: 1.6;'>
+        $exit
+    </p>
+</div>
+""")
+
+_STRATEGY_BEST_TPL = Template("""
+<div class='kiwi-card kiwi-card--teal kiwi-card--mt'>
+    <p style='color: #00bcd4; font-size: 14px; font-weight: 600; margin: 0 0 10px 0;'>✨ BEST PERFORMANCE</p>
+    <p style='color: #ffffff; margin: 0; font-size: 13px; line-height: 1.6;'>
+        This strategy excels in <strong>$best_in</strong>
+    </p>
+</div>
+""")
+
+_STRATEGY_ADVANTAGE_TPL = Template("""
+<div class='kiwi-card kiwi-card--orange kiwi-card--mt'>
+    <p style='color: #ff9800; font-size: 14px; font-weight: 600; margin: 0 0 10px 0;'>💪 COMPETITIVE ADVANTAGE</p>
+    <p style='color: #ffffff; margin: 0; font-size: 13px; line-height: 1.6;'>
+        $advantage
+    </p>
+</div>
+""")
+
+_STATUS_INITIALIZING_TPL = Template("""
+<div class='kiwi-card kiwi-card--cyan kiwi-card--lg kiwi-card--mb'>
+    <p style='color: #00d9ff; font-size: 16px; font-weight: 600; margin: 0 0 10px 0; text-align: center;'>
+        🔄 Initializing AI Intelligence
+    </p>
+    <p style='color: #ffffff; margin: 0; font-size: 14px; text-align: center; line-height: 1.6;'>
+        Collecting live market data for <strong>$selected_symbol</strong> and preparing analysis algorithms...
+    </p>
+</div>
+""")
+
+_STATUS_POSITION_TPL = Template("""
+<div class='kiwi-card kiwi-card--green kiwi-card--lg kiwi-card--mb'>
+    <p style='color: #4caf50; font-size: 16px; font-weight: 600; margin: 0 0 10px 0; text-align: center;'>
+        ✅ LONG Position Active on $selected_symbol
+    </p>
+    <p style='color: #ffffff; margin: 0; font-size: 14px; text-align: center; line-height: 1.6;'>
+        You have an active long position. AI is continuously monitoring for optimal exit signals.
+    </p>
+</div>
+""")
+
+# Two equal columns as plain CSS grid - avoids st.columns container blocks for static cards
+_GRID_2COL_TPL = Template("""
+<div style='display: grid; grid-template-columns: 1fr 1fr; gap: 1rem;'>
+$left
+$right
+</div>
+""")
+
+# Display lookups shared by the AI Intelligence row and the detail panels
+_REGIME_ICONS = {
+    'TREND': '🟢',
+    'SIDEWAYS': '🟡',
+    'VOLATILE': '🔴',
+    'Unknown': '⚪',
+    'Initializing...': '🔄'
+}
+
+_RISK_COLORS = {'LOW': '#4caf50', 'MEDIUM': '#ff9800', 'HIGH': '#f44336', 'N/A': '#888'}
+
+_RISK_STATUS_ICONS = {'HEALTHY': '🟢', 'WARNING': '🟡', 'CRITICAL': '🔴'}
+
+# Regime reference data - '_risk_word' is precomputed so renders never re-split 'risk'
+_REGIME_INFO = {
+    'TREND': {
+        'description': 'Strong directional movement in prices',
+        'characteristics': '• Clear price direction\n• Higher highs or lower lows\n• Sustained momentum',
+        'best_for': 'Trend Following strategies work best',
+        'risk': 'Medium - Follow the trend, avoid fighting it',
+        '_risk_word': 'MEDIUM'
+    },
+    'SIDEWAYS': {
+        'description': 'Price consolidation within a range',
+        'characteristics': '• Limited price movement\n• Support and resistance levels\n• Low volatility',
+        'best_for': 'Mean Reversion strategies excel here',
+        'risk': 'Low - Predictable range-bound movement',
+        '_risk_word': 'LOW'
+    },
+    'VOLATILE': {
+        'description': 'High price fluctuations and uncertainty',
+        'characteristics': '• Rapid price swings\n• Increased volume\n• Breakout potential',
+        'best_for': 'Volatility Breakout strategies thrive',
+        'risk': 'High - Requires careful position sizing',
+        '_risk_word': 'HIGH'
+    },
+    'Unknown': {
+        'description': 'Insufficient data for classification',
+        'characteristics': '• Collecting market data\n• Building price history\n• Analyzing patterns',
+        'best_for': 'Waiting for clear market structure',
+        'risk': 'N/A - System initializing',
+        '_risk_word': 'N/A'
+    }
+}
+
+# Bullet lines render as block-level divs, so no '<br>' separator is needed
+_CHAR_DIV_FMT = "<div style='padding: 5px 0;'>%s</div>"
+
+for _info in _REGIME_INFO.values():
+    _info['_characteristics_html'] = ''.join(_CHAR_DIV_FMT % line for line in _info['characteristics'].split('\n'))
+
+# Exchange prefix per TradingView symbol ('NASDAQ:AAPL' -> 'NASDAQ')
+_exchange_cache = {}
+
+
+def _exchange_of(tv):
+    """Return the exchange prefix of a TradingView symbol, memoized per symbol."""
+    e = _exchange_cache.get(tv)
+    return e if e is not None else _exchange_cache.setdefault(tv, tv.partition(':')[0])
+
+
+# st.html (Streamlit 1.33+) sends HTML as-is, skipping the frontend markdown parser
+if hasattr(st, 'html'):
+    def _render_html(html):
+        """Render a raw HTML fragment."""
+        st.html(html)
+else:
+    def _render_html(html):
+        """Render a raw HTML fragment (pre-1.33 fallback)."""
+        st.markdown(html, unsafe_allow_html=True)
+
+
+# st.fragment (1.37+, st.experimental_fragment in 1.33-1.36) reruns a single block
+# on its own timer; None on older Streamlit, where the whole page reruns instead
+_fragment = getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment', None)
+
+
+# Strategy reference data shown in the strategy detail panel
+_STRATEGY_INFO = {
+    'Trend Following': {
+        'description': 'Captures sustained directional moves',
+        'logic': 'Identifies and follows strong trends using moving averages and momentum indicators',
+        'indicators': '• EMA (20/50 periods)\n• MACD\n• ADX for trend strength',
+        'entry': 'When price crosses above EMA and MACD confirms',
+        'exit': 'When trend reverses or momentum weakens',
+        'best_in': 'TREND markets',
+        'advantage': 'High reward potential in strong trends'
+    },
+    'Mean Reversion': {
+        'description': 'Profits from price returning to average',
+        'logic': 'Identifies overbought/oversold conditions and trades reversals back to mean',
+        'indicators': '• Bollinger Bands\n• RSI\n• Standard deviation',
+        'entry': 'When price reaches extreme levels (oversold/overbought)',
+        'exit': 'When price returns to moving average',
+        'best_in': 'SIDEWAYS markets',
+        'advantage': 'Consistent profits in range-bound conditions'
+    },
+    'Volatility Breakout': {
+        'description': 'Captures explosive price movements',
+        'logic': 'Detects compression followed by expansion, trading the breakout',
+        'indicators': '• ATR (Average True Range)\n• Donchian Channels\n• Volume spikes',
+        'entry': 'When price breaks out of consolidation with volume',
+        'exit': 'When volatility contracts or breakout fails',
+        'best_in': 'VOLATILE markets',
+        'advantage': 'Large moves in short timeframes'
+    },
+    'Analyzing...': {
+        'description': 'AI is evaluating market conditions',
+        'logic': 'Analyzing historical data and current market regime',
+        'indicators': '• Collecting price data\n• Calculating indicators\n• Detecting patterns',
+        'entry': 'Waiting for strategy selection',
+        'exit': 'Pending analysis completion',
+        'best_in': 'Initializing...',
+        'advantage': 'Ensuring optimal strategy selection'
+    },
+    'None': {
+        'description': 'No strategy selected - system stopped',
+        'logic': 'Start trading to enable AI strategy selection',
+        'indicators': '• System idle',
+        'entry': 'N/A',
+        'exit': 'N/A',
+        'best_in': 'N/A',
+        'advantage': 'Safe mode - no active trading'
+    }
+}
+
+
+for _info in _STRATEGY_INFO.values():
+    _info['_indicators_html'] = ''.join(_CHAR_DIV_FMT % line for line in _info['indicators'].split('\n'))
+
+
+# Scanning status carousel - one item shown per 10-second window. Items whose content
+# depends on the live symbol/regime/strategy hold a Template; the rest are final strings.
+_SCAN_STATUS_ITEMS = (
+    {
+        'icon': '🔍',
+        'label': 'Scanning Status',
+        'content': Template('AI actively analyzing <strong>$selected_symbol</strong> for high-probability entry signals')
+    },
+    {
+        'icon': '📊',
+        'label': 'Monitoring',
+        'content': 'Price action analyzed every minute with 3-second updates'
+    },
+    {
+        'icon': '🧠',
+        'label': 'Market Regime',
+        'content': Template('Evaluating <strong>$regime_display</strong> market conditions')
+    },
+    {
+        'icon': '🎯',
+        'label': 'Active Strategy',
+        'content': Template('Using <strong>$strategy_display</strong> strategy')
+    },
+    {
+        'icon': '🎯',
+        'label': 'Looking For',
+        'content': 'Optimal entry points • Risk/reward setups • Multi-indicator confirmation • Volume validation'
+    },
+    {
+        'icon': '🔔',
+        'label': 'Alert Status',
+        'content': 'Ready to notify when strong buy signals detected with high confidence'
+    }
+)
+
+
+# Progress dot per carousel item: index 0 = active, 1 = inactive
+_DOT_HTML = ("<div class='kiwi-dot kiwi-dot--on'></div>", "<div class='kiwi-dot'></div>")
+
+
+_SCAN_STATUS_TPL = Template("""
+<div class='kiwi-status-box'>
+    <div class='kiwi-status-box__head'>
+        <p class='kiwi-status-box__title'>🔍 AI SCANNING STATUS</p>
+        <p class='kiwi-status-box__subtitle'>Real-time market analysis and signal detection</p>
+    </div>
+    <div class='kiwi-status-box__body'>
+        <div class='kiwi-status-box__icon'>$icon</div>
+        <div class='kiwi-status-box__label'>$label</div>
+        <div class='kiwi-status-box__content'>$content</div>
+    </div>
+    <div class='kiwi-dots'>$dots_html</div>
+</div>
+""")
+
+
+_SCAN_ANIMATION_HTML = """
+<div class='kiwi-scan'>
+    <div class='kiwi-scan__icon'>🔍</div>
+    <p class='kiwi-scan__label'>Actively Scanning...</p>
+</div>
+"""
+
+
+@lru_cache(maxsize=64)
+def _scan_status_html(cycle_index, selected_symbol, regime_display, strategy_display):
+    """Assemble the scanning carousel box; the key only changes every 10-second window."""
+    # Get current status item - only the symbol/regime/strategy slots need formatting
+    current_status = _SCAN_STATUS_ITEMS[cycle_index]
+    content = current_status['content']
+    if isinstance(content, Template):
+        content = content.substitute(
+            selected_symbol=selected_symbol,
+            regime_display=regime_display,
+            strategy_display=strategy_display
+        )
+    
+    # Build progress dots - highlight the active item
+    dots_html = ''.join(_DOT_HTML[i != cycle_index] for i in range(len(_SCAN_STATUS_ITEMS)))
+    
+    return _SCAN_STATUS_TPL.substitute(
+        icon=current_status['icon'],
+        label=current_status['label'],
+        content=content,
+        dots_html=dots_html
+    )
+
+
+# Open positions table - broker field -> display column; formatting is left to the frontend
+_POSITION_COLUMNS = {
+    'symbol': 'Symbol',
+    'qty': 'Quantity',
+    'avg_entry_price': 'Entry',
+    'current_price': 'Current',
+    'market_value': 'Value',
+    'unrealized_pl': 'P&L',
+    'unrealized_plpc': 'P&L %'
+}
+
+_POSITION_COLUMN_CONFIG = {
+    'Entry': st.column_config.NumberColumn(format="$%.2f"),
+    'Current': st.column_config.NumberColumn(format="$%.2f"),
+    'Value': st.column_config.NumberColumn(format="$%.2f"),
+    'P&L': st.column_config.NumberColumn(format="$%.2f"),
+    'P&L %': st.column_config.NumberColumn(format="%.2f%%")
+}
+
+
+# 5-minute analysis trend styling by move bucket (0 = up, 1 = flat, 2 = down):
+# (direction, text colour, background, border)
+_TREND_STYLES = (
+    ("📈 Upward", "#4caf50", "rgba(76,175,80,0.1)", "rgba(76,175,80,0.3)"),
+    ("➡️ Sideways", "#ff9800", "rgba(255,152,0,0.1)", "rgba(255,152,0,0.3)"),
+    ("📉 Downward", "#f44336", "rgba(244,67,54,0.1)", "rgba(244,67,54,0.3)")
+)
+
+# 5-minute analysis verdicts keyed by (bucket, regime, strategy); None is a wildcard.
+# Values: (assessment, colour, reasoning format string, recommendation)
+_SIGNAL_TABLE = {
+    (0, 'TREND', None): (
+        "✅ BULLISH SIGNAL", "#4caf50",
+        "Price is rising (+{price_change:.2f}%) in a <strong>TREND</strong> market. This aligns with our {strategy_display} strategy. Volume is {volume_trend}, confirming momentum.",
+        "💡 <strong>This could be a good opportunity to BUY</strong> if entry conditions are fully met. Monitor for confirmation signals."
+    ),
+    (0, None, None): (
+        "⚠️ CAUTION", "#ff9800",
+        "Price is rising (+{price_change:.2f}%) but market regime is <strong>{regime_display}</strong>. Current conditions may not sustain upward movement.",
+        "💡 <strong>Wait for better setup.</strong> Price rise in non-trending markets often leads to reversals."
+    ),
+    (1, None, None): (
+        "⏸️ NEUTRAL", "#888",
+        "Price movement is minimal ({price_change:+.2f}%) over the last 5 minutes. Market is consolidating.",
+        "💡 <strong>No clear signal yet.</strong> Waiting for more decisive price action before suggesting entry."
+    ),
+    (2, 'SIDEWAYS', 'Mean Reversion'): (
+        "✅ POTENTIAL OPPORTUNITY", "#4caf50",
+        "Price dropped ({price_change:.2f}%) in a <strong>SIDEWAYS</strong> market. Mean reversion strategy may find entry as price approaches support.",
+        "💡 <strong>Monitor for bounce signals</strong> near support levels. This could present a buying opportunity."
+    ),
+    (2, None, None): (
+        "🛑 BEARISH SIGNAL", "#f44336",
+        "Price is falling ({price_change:.2f}%) with {volume_trend} volume. Current {strategy_display} strategy suggests caution.",
+        "💡 <strong>NOT a good time to BUY.</strong> Wait for price stabilization or trend reversal confirmation."
+    )
+}
+
+
+# 5-minute analysis cards, filled with str.format_map from one context dict
+_ANALYSIS_TPL = """
+<div style='background: {trend_bg}; border-radius: 8px; padding: 15px; border: 1px solid {trend_border}; margin-bottom: 15px;'>
+    <p style='color: {trend_color}; font-size: 14px; font-weight: 600; margin: 0 0 10px 0;'>🧠 AI 5-MINUTE ANALYSIS</p>
+    <div style='color: #ffffff; font-size: 13px; line-height: 1.8;'>
+        <div style='padding: 5px 0;'><strong>Price Movement:</strong> {trend_direction} ({price_change:+.2f}%)</div>
+        <div style='padding: 5px 0;'><strong>Current Price:</strong> ${last_price:.2f}</div>
+        <div style='padding: 5px 0;'><strong>Volume Trend:</strong> {volume_label}</div>
+        <div style='padding: 5px 0; margin-top: 10px;'><span style='color: {signal_color}; font-weight: 600;'>{signal_assessment}</span></div>
+        <div style='padding: 5px 0; margin-top: 5px; background: rgba(0,0,0,0.2); border-radius: 4px; padding: 10px;'>
+            {reasoning}
+        </div>
+    </div>
+</div>
+"""
+
+_RECO_TPL = """
+<div class='kiwi-card kiwi-card--cyan kiwi-card--mb'>
+    <p style='color: #00d9ff; font-size: 14px; font-weight: 600; margin: 0 0 10px 0;'>🎯 AI RECOMMENDATION</p>
+    <p style='color: #ffffff; margin: 0; font-size: 13px; line-height: 1.6;'>
+        {recommendation}
+    </p>
+</div>
+"""
+
+
+@lru_cache(maxsize=256)
+def _analysis_html(bucket, change_hundredths, last_cents, volume_trend, regime_display, strategy_display):
+    """Assemble the AI 5-minute analysis and recommendation cards from quantized inputs."""
+    price_change = change_hundredths / 100
+    last_price = last_cents / 100
+    
+    # Determine trend direction
+    trend_direction, trend_color, trend_bg, trend_border = _TREND_STYLES[bucket]
+    
+    # Generate AI analysis message - most specific (regime, strategy) match wins
+    signal_assessment, signal_color, reasoning_fmt, recommendation = (
+        _SIGNAL_TABLE.get((bucket, regime_display, strategy_display))
+        or _SIGNAL_TABLE.get((bucket, regime_display, None))
+        or _SIGNAL_TABLE[(bucket, None, None)]
+    )
+    reasoning = reasoning_fmt.format(
+        price_change=price_change,
+        regime_display=regime_display,
+        strategy_display=strategy_display,
+        volume_trend=volume_trend
+    )
+    
+    ctx = {
+        'trend_direction': trend_direction,
+        'trend_color': trend_color,
+        'trend_bg': trend_bg,
+        'trend_border': trend_border,
+        'price_change': price_change,
+        'last_price': last_price,
+        'volume_label': volume_trend.capitalize(),
+        'signal_assessment': signal_assessment,
+        'signal_color': signal_color,
+        'reasoning': reasoning,
+        'recommendation': recommendation
+    }
+    
+    # Display AI 5-Minute Analysis
+    return _ANALYSIS_TPL.format_map(ctx) + _RECO_TPL.format_map(ctx)
+
+
+# Position sizing advice appended to BUY notifications. Kept unindented so the
+# markdown parser treats the card as an HTML block, not a code block.
+_SIZING_CARD_TPL = Template("""
+
+##### 💰 Recommended Position Sizing
+
+<div style='background: rgba(255,255,255,0.05); padding: 12px; border-radius: 8px; border-left: 3px solid $sizing_color; margin-top: 15px;'>
+<p style='margin: 0; font-size: 13px;'>$sizing_explanation</p>
+<p style='margin: 8px 0 0 0; color: $sizing_color; font-size: 14px; font-weight: 600;'>
+💡 Suggested: $recommended_qty shares (adjust based on your capital)
+</p>
+</div>
+""")
+
+
+def _queue_toast(message, icon=None):
+    """Queue a toast for the next page render, so handlers can st.rerun() without sleeping."""
+    st.session_state.pending_toast = (message, icon)
+
+
+# Live refresh pacing (seconds) - with fragments the dashboard reruns when
+# _live_fingerprint changes, checked this often; without them it reruns on this cadence
+_RERUN_MIN_SECONDS = 3
+# Scanning panel fragment cadence (seconds), when st.fragment is available
+_SCAN_REFRESH_SECONDS = 3
+
+
+def _live_fingerprint():
+    """Summarize the live state rendered outside the fragments, to detect when a rerun is needed."""
+    return (
+        trading_state.current_regime,
+        trading_state.current_strategy,
+        trading_state.position_state,
+        trading_state.notification,
+        trading_state.error_log_version
+    )
+
+
+def _live_refresh(live_fingerprint):
+    """Rerun the page once the live state it rendered has changed."""
+    if trading_state.running and _live_fingerprint() != live_fingerprint:
+        st.rerun()
+
+
+if _fragment is not None:
+    # Checked in place every _RERUN_MIN_SECONDS, so the page script can finish and
+    # the section fragments keep their own timers
+    _live_refresh = _fragment(run_every=_RERUN_MIN_SECONDS)(_live_refresh)
+
+
+def _trading_thread_alive():
+    """True while a stopped trading thread is still shutting down."""
+    return not trading_state.running and trading_state.thread is not None and trading_state.thread.is_alive()
+
+
+def _await_thread_exit():
+    """Rerun the page once the stopped trading thread has exited."""
+    if not _trading_thread_alive():
+        st.rerun()
+
+
+if _fragment is not None:
+    _await_thread_exit = _fragment(run_every=1)(_await_thread_exit)
+
+
+# ============================================================================
+# DETAIL PANELS - one renderer per AI Intelligence header button
+# ============================================================================
+
+def _render_asset_details(selected_symbol, selected_asset_name, asset_category, tradingview_symbol,
+                          regime_display, regime_icon, strategy_display):
+    """Render the asset overview panel."""
+    exchange = _exchange_of(tradingview_symbol)
+    market = _MARKET_BY_CATEGORY(asset_category) or 'INDEX'
+    
+    parts = [
+        # Professional Asset Details with styled table
+        _ASSET_HEADER_TPL.substitute(selected_symbol=selected_symbol),
+        # Asset Information Table and market link side by side
+        _GRID_2COL_TPL.substitute(
+            left=_ASSET_TABLE_TPL.substitute(
+                selected_symbol=selected_symbol,
+                selected_asset_name=selected_asset_name,
+                asset_category=asset_category,
+                exchange=exchange
+            ),
+            right=_ASSET_PERFORMANCE_TPL.substitute(
+                finance_url=_finance_url(selected_symbol, market)
+            )
+        ),
+        # Current Analysis Section - three status tiles in one grid row
+        _ASSET_ANALYSIS_STATUS_HTML,
+        # Why This Asset Section
+        _ASSET_WHY_TPL.substitute(selected_symbol=selected_symbol)
+    ]
+    
+    _render_html(''.join(parts))
+
+
+@lru_cache(maxsize=32)
+def _regime_html(regime_display, regime_icon):
+    """Assemble the market regime panel HTML; pure function of the regime shown."""
+    current_regime_info = _REGIME_INFO.get(regime_display, _REGIME_INFO['Unknown'])
+    
+    # Risk Level and AI Detection
+    risk_color = _RISK_COLORS.get(current_regime_info['_risk_word'], '#ff9800')
+    
+    parts = [
+        # Professional Market Regime Details
+        _REGIME_HEADER_TPL.substitute(
+            regime_icon=regime_icon, regime_display=regime_display
+        ),
+        # Regime Overview
+        _REGIME_OVERVIEW_TPL.substitute(
+            regime_icon=regime_icon, description=current_regime_info['description']
+        ),
+        # Two-column layout for characteristics and strategy
+        _GRID_2COL_TPL.substitute(
+            left=_REGIME_CHARACTERISTICS_TPL.substitute(
+                characteristics_html=current_regime_info['_characteristics_html']
+            ),
+            right=_REGIME_STRATEGY_TPL.substitute(best_for=current_regime_info['best_for'])
+        ),
+        _REGIME_RISK_TPL.substitute(
+            risk_color=risk_color, risk=current_regime_info['risk']
+        ),
+        _REGIME_DETECTION_HTML
+    ]
+    
+    return ''.join(parts)
+
+
+def _render_regime_details(selected_symbol, selected_asset_name, asset_category, tradingview_symbol,
+                           regime_display, regime_icon, strategy_display):
+    """Render the market regime analysis panel."""
+    _render_html(_regime_html(regime_display, regime_icon))
+
+
+@lru_cache(maxsize=16)
+def _strategy_html(strategy_display):
+    """Assemble the strategy deep-dive panel HTML; pure function of the strategy shown."""
+    current_strategy_info = _STRATEGY_INFO.get(strategy_display, _STRATEGY_INFO['None'])
+    
+    # Build the whole panel into one buffer so it ships as a single element
+    parts = [
+        _STRATEGY_HEADER_TPL.substitute(strategy_display=strategy_display),
+        _STRATEGY_OVERVIEW_TPL.substitute(description=current_strategy_info['description']),
+        _STRATEGY_LOGIC_TPL.substitute(logic=current_strategy_info['logic']),
+        _STRATEGY_INDICATORS_TPL.substitute(indicators_html=current_strategy_info['_indicators_html']),
+        # Entry and Exit Conditions side by side
+        _GRID_2COL_TPL.substitute(
+            left=_STRATEGY_ENTRY_TPL.substitute(entry=current_strategy_info['entry']),
+            right=_STRATEGY_EXIT_TPL.substitute(exit=current_strategy_info['exit'])
+        ),
+        _STRATEGY_BEST_TPL.substitute(best_in=current_strategy_info['best_in']),
+        _STRATEGY_ADVANTAGE_TPL.substitute(advantage=current_strategy_info['advantage'])
+    ]
+    
+    # Why AI Selected This
+    parts.append("""
+    <div class='kiwi-card kiwi-card--cyan kiwi-card--mt'>
+        <p style='color: #00d9ff; font-size: 14px; font-weight: 600; margin: 0 0 10px 0;'>🤖 WHY AI SELECTED THIS</p>
+        <p style='color: #ffffff; margin: 0; font-size: 13px; line-height: 1.6;'>
+            The AI automatically chooses the most suitable strategy based on current market regime. 
+            This ensures you're always trading with the optimal approach for current conditions, 
+            maximizing your probability of success.
+        </p>
+    </div>
+    """)
+    
+    return ''.join(parts)
+
+
+def _render_strategy_details(selected_symbol, selected_asset_name, asset_category, tradingview_symbol,
+                             regime_display, regime_icon, strategy_display):
+    """Render the strategy deep-dive panel."""
+    _render_html(_strategy_html(strategy_display))
+
+
+def _render_scanning_status(selected_symbol, regime_display, strategy_display):
+    """Render the scanning carousel and 5-minute analysis of the status panel."""
+    # Animated Status Switcher - cycles every 10 seconds
+    current_time = int(time.time())
+    cycle_index = (current_time // 10) % len(_SCAN_STATUS_ITEMS)  # switch every 10 seconds
+    
+    # Build the animated status display - UNIFIED FULL BOX with same gradient throughout
+    parts = [_scan_status_html(cycle_index, selected_symbol, regime_display, strategy_display)]
+    
+    # AI 5-Minute Analysis (NEW FEATURE) - recomputed only when a new bar lands
+    # or the regime/strategy changes; otherwise the last rendered cards are reused
+    analysis_fp = (selected_symbol, trading_state.bar_count, regime_display, strategy_display)
+    if st.session_state.get('analysis_fp') == analysis_fp:
+        analysis_html = st.session_state.analysis_html
+    else:
+        analysis_html = ''
+        bars = trading_state.bar_history.get(selected_symbol)
+        if bars is not None:
+            if len(bars) >= 5:  # Need at least 5 bars for analysis
+                # Get last 5 bars for 5-minute analysis
+                recent_closes = bars.close[-5:]
+                recent_volumes = bars.volume[-5:]
+                
+                # Calculate price movement
+                first_price = float(recent_closes[0])
+                last_price = float(recent_closes[-1])
+                price_change = ((last_price - first_price) / first_price) * 100
+                
+                # Calculate volume trend
+                avg_volume = recent_volumes.mean()
+                latest_volume = recent_volumes[-1]
+                volume_trend = "increasing" if latest_volume > avg_volume else "decreasing"
+                
+                # Bucket the move once (0 = up, 1 = flat, 2 = down); it indexes both
+                # the trend styling and the verdict table
+                bucket = 1 - (price_change > 0.5) + (price_change < -0.5)
+                
+                # Quantize to the displayed precision so consecutive reruns hit the cache
+                analysis_html = _analysis_html(
+                    bucket, round(price_change * 100), round(last_price * 100),
+                    volume_trend, regime_display, strategy_display
+                )
+        st.session_state.analysis_fp = analysis_fp
+        st.session_state.analysis_html = analysis_html
+    parts.append(analysis_html)
+    
+    # Add scanning animation
+    parts.append(_SCAN_ANIMATION_HTML)
+    
+    _render_html(''.join(parts))
+
+
+if _fragment is not None:
+    # Advance the carousel and pick up new bars in place instead of rerunning the page
+    _render_scanning_status = _fragment(run_every=_SCAN_REFRESH_SECONDS)(_render_scanning_status)
+
+
+def _render_status_details(selected_symbol, selected_asset_name, asset_category, tradingview_symbol,
+                           regime_display, regime_icon, strategy_display):
+    """Render the system status panel for the current trading state."""
+    if not trading_state.running:
+        # Professional Status Details - System Stopped (sections rotate via the
+        # .status-rotator animation in style.css - st.html drops <script> tags)
+        _render_html("""
+        <div id="status-container" class="status-rotator" style="background: linear-gradient(135deg, rgba(15, 12, 41, 0.95) 0%, rgba(26, 26, 46, 0.95) 100%); border-radius: 16px; padding: 30px; border: 1px solid rgba(255, 255, 255, 0.1); box-shadow: 0 8px 32px rgba(0, 0, 0, 0.4); min-height: 200px; position: relative; overflow: hidden; margin-top: 20px; margin-bottom: 40px;">
+            <div class="status-section" style="color: #888; font-size: 18px; font-weight: 700; text-align: center;">
+                ⚪ System Status: Inactive
+            </div>
+            <div class="status-section" style="background: rgba(108,117,125,0.1); border-radius: 12px; padding: 20px; border: 1px solid rgba(108,117,125,0.3);">
+                <p style="color: #6c757d; font-size: 16px; font-weight: 600; margin: 0 0 10px 0; text-align: center;">⚪ Trading System Inactive</p>
+                <p style="color: #ffffff; margin: 0; font-size: 14px; text-align: center; line-height: 1.6;">The trading system is currently not running. Start trading to activate AI analysis and signal detection.</p>
+            </div>
+            <div class="status-section" style="background: rgba(0,217,255,0.1); border-radius: 12px; padding: 20px; border: 1px solid rgba(0,217,255,0.3);">
+                <p style="color: #00d9ff; font-size: 16px; font-weight: 600; margin: 0 0 15px 0; text-align: center;">🚀 HOW TO START</p>
+                <div style="color: #ffffff; font-size: 14px; line-height: 1.8;">
+                    <div style="padding: 8px 0;"><strong>1.</strong> Click the <strong>Start Trading</strong> button above</div>
+                    <div style="padding: 8px 0;"><strong>2.</strong> System will connect to live market data</div>
+                    <div style="padding: 8px 0;"><strong>3.</strong> AI will begin analysis within 1-2 minutes</div>
+                </div>
+            </div>
+            <div class="status-section" style="background: rgba(76,175,80,0.1); border-radius: 12px; padding: 20px; border: 1px solid rgba(76,175,80,0.3);">
+                <p style="color: #4caf50; font-size: 16px; font-weight: 600; margin: 0 0 15px 0; text-align: center;">🛡️ SAFETY FEATURES</p>
+                <div style="color: #ffffff; font-size: 14px; line-height: 1.8;">
+                    <div style="padding: 8px 0;">✅ Paper trading enabled by default</div>
+                    <div style="padding: 8px 0;">✅ Risk management active</div>
+                    <div style="padding: 8px 0;">✅ Stop-loss protection ready</div>
+                </div>
+            </div>
+        </div>
+        """)
+    elif trading_state.current_regime == "Initializing...":
+        # Professional Status Details - Initializing (Static Display)
+        parts = []
+        parts.append("""
+        <div style='color: #00d9ff; font-size: 18px; font-weight: 700; margin-bottom: 20px; text-align: center;'>
+            🔄 System Status: Initializing
+        </div>
+        """)
+        
+        parts.append(_STATUS_INITIALIZING_TPL.substitute(selected_symbol=selected_symbol))
+        
+        # Progress Checklist
+        parts.append("""
+        <div class='kiwi-card kiwi-card--blue kiwi-card--mb'>
+            <p style='color: #2196f3; font-size: 14px; font-weight: 600; margin: 0 0 10px 0;'>📊 PROGRESS STATUS</p>
+            <div style='color: #ffffff; font-size: 13px; line-height: 1.8;'>
+                <div style='padding: 5px 0;'>✅ Connected to market feed</div>
+                <div style='padding: 5px 0;'>🔄 Building price history (20+ bars needed)</div>
+                <div style='padding: 5px 0;'>⏳ Preparing regime detection</div>
+                <div style='padding: 5px 0;'>⏳ Loading strategy algorithms</div>
+            </div>
+        </div>
+        """)
+        
+        # Estimated Time
+        parts.append("""
+        <div class='kiwi-card kiwi-card--orange'>
+            <p style='color: #ff9800; font-size: 14px; font-weight: 600; margin: 0 0 10px 0;'>⏱️ ESTIMATED TIME</p>
+            <p style='color: #ffffff; margin: 0; font-size: 13px; line-height: 1.6;'>
+                <strong>1-2 minutes</strong> - This is a one-time setup. Once complete, 
+                analysis will run continuously in real-time!
+            </p>
+        </div>
+        """)
+        
+        # Add animated progress
+        parts.append("""
+        <div style='text-align: center; padding: 30px 20px;'>
+            <div class='kiwi-pulse' style='display: inline-block; font-size: 50px;'>
+                🔄
+            </div>
+            <p style='color: #00d9ff; margin-top: 15px; font-weight: 600; font-size: 16px;'>Initializing...</p>
+        </div>
+        """)
+        
+        _render_html(''.join(parts))
+    elif trading_state.position_state == 'long':
+        # Professional Status Details - Position Active
+        parts = []
+        parts.append("""
+        <div style='color: #4caf50; font-size: 18px; font-weight: 700; margin-bottom: 20px; text-align: center;'>
+            ✅ System Status: Position Active
+        </div>
+        """)
+        
+        parts.append(_STATUS_POSITION_TPL.substitute(selected_symbol=selected_symbol))
+        
+        # AI Monitoring
+        parts.append("""
+        <div class='kiwi-card kiwi-card--cyan kiwi-card--mb'>
+            <p style='color: #00d9ff; font-size: 14px; font-weight: 600; margin: 0 0 10px 0;'>🤖 AI MONITORING</p>
+            <div style='color: #ffffff; font-size: 13px; line-height: 1.8;'>
+                <div style='padding: 5px 0;'>📊 Tracking price movements in real-time</div>
+                <div style='padding: 5px 0;'>🎯 Analyzing exit signals continuously</div>
+                <div style='padding: 5px 0;'>🛡️ Stop-loss protection active</div>
+                <div style='padding: 5px 0;'>⏱️ Updates every 3 seconds</div>
+            </div>
+        </div>
+        """)
+        
+        # What AI Is Watching
+        parts.append("""
+        <div class='kiwi-card kiwi-card--orange kiwi-card--mb'>
+            <p style='color: #ff9800; font-size: 14px; font-weight: 600; margin: 0 0 10px 0;'>👁️ WHAT AI IS WATCHING</p>
+            <div style='color: #ffffff; font-size: 13px; line-height: 1.8;'>
+                <div style='padding: 5px 0;'>• Trend reversal signals</div>
+                <div style='padding: 5px 0;'>• Momentum weakening</div>
+                <div style='padding: 5px 0;'>• Support level breaks</div>
+                <div style='padding: 5px 0;'>• Volume changes</div>
+            </div>
+        </div>
+        """)
+        
+        # Notification Alert
+        parts.append("""
+        <div class='kiwi-card kiwi-card--blue'>
+            <p style='color: #2196f3; font-size: 14px; font-weight: 600; margin: 0 0 10px 0;'>🔔 YOU'LL BE NOTIFIED WHEN</p>
+            <p style='color: #ffffff; margin: 0; font-size: 13px; line-height: 1.6;'>
+                The AI detects optimal exit conditions to protect profits or minimize losses. 
+                Exit signals will appear prominently when conditions are met.
+            </p>
+        </div>
+        """)
+        
+        _render_html(''.join(parts))
+    else:
+        _render_scanning_status(selected_symbol, regime_display, strategy_display)
+
+
+_PANEL_RENDERERS = {
+    'asset': _render_asset_details,
+    'regime': _render_regime_details,
+    'strategy': _render_strategy_details,
+    'status': _render_status_details
+}
+
+# ============================================================================
+# LIVE ACCOUNT SECTIONS - each refreshes on its own cadence when st.fragment exists
+# ============================================================================
+
+# Fragment cadences (seconds)
+_ACCOUNT_REFRESH_SECONDS = 10
+_POSITIONS_REFRESH_SECONDS = 3
+_TRADES_REFRESH_SECONDS = 3
+
+
+def _positions_frame(positions):
+    """Build the numeric positions frame shared by the P&L total and the positions table."""
+    return pd.DataFrame.from_records(positions, columns=list(_POSITION_COLUMNS))
+
+
+def _render_account_status(settings):
+    """Render the account metrics and the market analysis & risk summary."""
+    try:
+        # Latest broker snapshot published by the trading loop
+        account = trading_state.account
+        positions = trading_state.positions
+        
+        st.subheader("💼 Account Status")
+        acc_cols = st.columns(4)
+        
+        # Bind the snapshot values once for the metric cards
+        initial_capital = settings['initial_capital']
+        portfolio_value = account.get('portfolio_value', 0)
+        cash = account.get('cash', 0)
+        
+        acc_cols[0].metric(
+            "💰 Portfolio Value",
+            f"${portfolio_value:,.2f}",
+            delta=f"{((portfolio_value / initial_capital) - 1) * 100:.2f}%"
+        )
+        
+        acc_cols[1].metric("💵 Cash", f"${cash:,.2f}")
+        acc_cols[2].metric("📍 Open Positions", len(positions))
+        
+        total_pl = float(_positions_frame(positions)['unrealized_pl'].sum())
+        acc_cols[3].metric(
+            "📈 Unrealized P&L",
+            f"${total_pl:.2f}",
+            delta=f"{(total_pl / portfolio_value * 100):.2f}%" if portfolio_value > 0 else "0%"
+        )
+        
+        # Market Intelligence & Risk
+        st.subheader("Market Analysis & Risk")
+        intel_cols = st.columns(2)
+        
+        with intel_cols[0]:
+            st.markdown("**🧠 Market Intelligence**")
+            current_regime = trading_state.current_regime
+            st.markdown(f"- **Regime:** {_REGIME_ICONS.get(current_regime, '⚪')} {current_regime}")
+            st.markdown(f"- **Strategy:** 🎯 {trading_state.current_strategy}")
+
+        with intel_cols[1]:
+            st.markdown("**🛡️ Risk Management**")
+            risk_manager = get_session_risk_manager(settings)
+            risk_summary = risk_manager.get_risk_summary(
+                account,
+                {pos['symbol']: pos for pos in positions}
+            )
+            risk_status = risk_summary['risk_status']
+            st.markdown(f"- **Status:** {_RISK_STATUS_ICONS.get(risk_status, '⚪')} {risk_status}")
+            st.markdown(f"- **Drawdown:** {risk_summary['drawdown_pct']:.2f}%")
+    
+    except Exception as e:
+        st.error(f"Error fetching account data: {e}")
+
+
+def _render_open_positions():
+    """Render the open positions table."""
+    try:
+        positions = trading_state.positions
+        st.subheader("📍 Open Positions")
+        if len(positions) > 0:
+            df = _positions_frame(positions).rename(columns=_POSITION_COLUMNS)
+            df['P&L %'] = df['P&L %'].fillna(0) * 100
+            st.dataframe(df, use_container_width=True, hide_index=True,
+                         column_config=_POSITION_COLUMN_CONFIG)
+        else:
+            st.info("No open positions")
+    
+    except Exception as e:
+        st.error(f"Error fetching positions: {e}")
+
+
+def _render_trading_activity():
+    """Render the most recent trades."""
+    st.subheader("📊 Trading Activity")
+    if trading_state.recent_trades:
+        st.markdown("**Recent Trades:**")
+        for trade in islice(trading_state.recent_trades, 5):
+            action_icon = "📈" if trade['action'] == 'BUY' else "📉"
+            st.text(f"{action_icon} {trade['time_str']} - {trade['action']} {trade['symbol']} @ ${trade['price']:.2f}")
+    else:
+        st.info("No recent trades")
+
+
+if _fragment is not None:
+    _render_account_status = _fragment(run_every=_ACCOUNT_REFRESH_SECONDS)(_render_account_status)
+    _render_open_positions = _fragment(run_every=_POSITIONS_REFRESH_SECONDS)(_render_open_positions)
+    _render_trading_activity = _fragment(run_every=_TRADES_REFRESH_SECONDS)(_render_trading_activity)
+
+
+def show_settings_page():
+    """Display settings configuration page."""
+    st.markdown(f'<h1>{get_iconly_icon("Setting", 24, "#00d9ff")} Settings</h1>', unsafe_allow_html=True)
+    
+    settings = load_settings()
+    
+    with st.form("settings_form"):
+        st.subheader("� Alpaca API Configuration")
+        st.markdown("Get your free API keys at [alpaca.markets](https://alpaca.markets/)")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            alpaca_key = st.text_input(
+                "API Key",
+                value=settings['alpaca_key'],
+                type="password",
+                help="Your Alpaca API key"
+            )
+        
+        with col2:
+            alpaca_secret = st.text_input(
+                "Secret Key",
+                value=settings['alpaca_secret'],
+                type="password",
+                help="Your Alpaca secret key"
+            )
+        
+        is_paper = st.checkbox(
+            "📄 Use Paper Trading (Recommended)",
+            value=settings['is_paper_trading'],
+            help="Paper trading uses fake money for testing. Uncheck for real money trading."
+        )
+        
         if not is_paper:
             st.error("⚠️ WARNING: Live trading will use REAL MONEY!")
         
@@ -1458,9 +2811,8 @@ def show_settings_page():
             }
             
             save_settings(new_settings)
-            st.success("✅ Settings saved successfully!")
+            _queue_toast("Settings saved successfully!", icon='✅')
             logger.logger.info(f"Settings saved via UI - Trading {selected_asset}")
-            time.sleep(1)
             st.rerun()
         except Exception as e:
             st.error(f"❌ Failed to save settings: {e}")
@@ -1496,6 +2848,9 @@ def show_settings_page():
 def show_dashboard_page():
     """Display unified trading dashboard with controls and asset selector."""
     
+    # Snapshot live state before rendering so changes that land mid-render still trigger a rerun
+    live_fingerprint = _live_fingerprint()
+    
     settings = load_settings()
     
     if not check_configuration():
@@ -1507,12 +2862,12 @@ def show_dashboard_page():
     # ============================================================================
     
     # Header Layout: Title Only
-    st.markdown(f"""
+    _render_html(f"""
 <div style='display: flex; align-items: center; justify-content: center; gap: 15px; margin-bottom: 20px;'>
     {get_logo_svg(width="50px")}
     <h1 style='margin: 0; color: #00d9ff; font-size: 28px;'>Kiwi AI Trading Dashboard</h1>
 </div>
-""", unsafe_allow_html=True)
+""")
 
     # ============================================================================
     # ASSET SELECTOR
@@ -1524,27 +2879,24 @@ def show_dashboard_page():
     with col_cat:
         current_category = settings.get('asset_category', 'Stocks')
         # Ensure current_category is valid
-        if current_category not in ASSET_CATEGORIES:
-            current_category = list(ASSET_CATEGORIES.keys())[0]
+        if current_category not in _ASSET_CATEGORY_NAMES:
+            current_category = _ASSET_CATEGORY_NAMES[0]
             
         asset_category = st.selectbox(
             "Category",
-            options=list(ASSET_CATEGORIES.keys()),
-            index=list(ASSET_CATEGORIES.keys()).index(current_category),
+            options=_ASSET_CATEGORY_NAMES,
+            index=_ASSET_CATEGORY_NAMES.index(current_category),
             key="asset_category_selector"
         )
         
     with col_asset:
-        assets_in_category = ASSET_CATEGORIES[asset_category]
-        asset_names = list(assets_in_category.keys())
+        category_slice = _ASSET_CATEGORY_SLICES[_ASSET_CATEGORY_NAMES.index(asset_category)]
+        asset_names = _ASSET_NAMES[category_slice]
+        asset_symbols = _ASSET_SYMBOLS[category_slice]
         
         # Find current selection
         current_tv_symbol = settings.get('tradingview_symbol', '')
-        default_index = 0
-        for idx, (name, tv_sym) in enumerate(assets_in_category.items()):
-            if tv_sym == current_tv_symbol:
-                default_index = idx
-                break
+        default_index = asset_symbols.index(current_tv_symbol) if current_tv_symbol in asset_symbols else 0
                 
         selected_asset_name = st.selectbox(
             "Assets",
@@ -1554,7 +2906,7 @@ def show_dashboard_page():
         )
         
         # Update settings logic
-        selected_tradingview_symbol = assets_in_category[selected_asset_name]
+        selected_tradingview_symbol = asset_symbols[asset_names.index(selected_asset_name)]
         if asset_category == "Stocks":
             selected_symbol = selected_tradingview_symbol.split(':')[1]
         elif asset_category == "Crypto":
@@ -1583,24 +2935,23 @@ def show_dashboard_page():
             if st.button("Stop", key="btn_stop", type="primary", use_container_width=True):
                 try:
                     trading_state.running = False
+                    trading_state.stop_event.set()
                     logger.logger.info("🛑 Stopping trading system...")
                     if trading_state.stream is not None:
                         try:
                             trading_state.stream.stop()
-                            time.sleep(3)
                             trading_state.stream = None
                         except:
                             pass
-                    if trading_state.thread is not None:
-                        trading_state.thread.join(timeout=5)
-                        trading_state.thread = None
-                    st.success("Stopped")
-                    time.sleep(2)
+                    # No join here - the page keeps rerunning until the thread has exited
+                    _queue_toast("Stopping...", icon='🛑')
                     st.rerun()
                 except Exception as e:
                     st.error(f"Error: {e}")
         else:
-            if st.button("Start", key="btn_start", type="primary", use_container_width=True):
+            stopping = _trading_thread_alive()
+            if st.button("Stopping..." if stopping else "Start", key="btn_start", type="primary",
+                         use_container_width=True, disabled=stopping):
                 # Check existing stream
                 if trading_state.stream is not None:
                     try:
@@ -1612,18 +2963,21 @@ def show_dashboard_page():
                 st.info("Starting...")
                 try:
                     trading_state.running = True
+                    trading_state.stop_event.clear()
                     trading_state.mode = 'realtime'
                     
+                    previous_thread = trading_state.thread
+                    
                     def run_realtime():
                         try:
-                            run_realtime_trading(settings)
+                            run_realtime_trading(settings, previous_thread)
                         except Exception as e:
                             log_error('Real-Time Mode', 'Critical error', e, {'settings': str(settings)})
                             trading_state.running = False
                     
                     trading_state.thread = threading.Thread(target=run_realtime, daemon=True)
                     trading_state.thread.start()
-                    time.sleep(2)
+                    _queue_toast("Starting...", icon='🚀')
                     st.rerun()
                 except Exception as e:
                     st.error(f"Failed: {e}")
@@ -1702,16 +3056,6 @@ def show_dashboard_page():
         'Power Hour': {'start': '15:00', 'end': '16:00', 'color': '#ff4444'}
     }
     
-    # Build overrides for ICT Killzones (vertical lines at session times)
-    overrides = {
-        "mainSeriesProperties.candleStyle.upColor": "#00d9ff",
-        "mainSeriesProperties.candleStyle.downColor": "#ff4444",
-        "mainSeriesProperties.candleStyle.borderUpColor": "#00d9ff",
-        "mainSeriesProperties.candleStyle.borderDownColor": "#ff4444",
-        "mainSeriesProperties.candleStyle.wickUpColor": "#00d9ff",
-        "mainSeriesProperties.candleStyle.wickDownColor": "#ff4444"
-    }
-    
     # Add session time markers if favorites are active
     if favorites:
         for fav in favorites:
@@ -1719,81 +3063,14 @@ def show_dashboard_page():
                 zone = killzone_times[fav]
                 pass
     
-    # Build studies JSON string
-    studies_json = json.dumps(studies)
-    
-    # Build compare symbols JSON
-    compare_json = json.dumps(compare_symbols_list)
-    
     # Create two-column layout for Chart and Market Data (Equal Size)
     chart_col, market_col = st.columns([1, 1])
     
     with chart_col:
         # Embed TradingView Advanced Chart
-        tradingview_html = f"""
-            <!DOCTYPE html>
-            <html style="margin: 0; padding: 0;">
-            <head>
-                <style>
-                    * {{
-                        margin: 0;
-                        padding: 0;
-                        box-sizing: border-box;
-                    }}
-                    body {{
-                        background: transparent;
-                        min-height: 720px;
-                    }}
-                    .chart-wrapper {{
-                        width: 100%;
-                        height: 720px;
-                    }}
-                    .tradingview-widget-container {{
-                        width: 100%;
-                        height: 100%;
-                    }}
-                    #tradingview_chart {{
-                        width: 100%;
-                        height: 100%;
-                    }}
-                </style>
-            </head>
-            <body>
-                <div class="chart-wrapper">
-                    <div class="tradingview-widget-container">
-                      <div id="tradingview_chart"></div>
-                    </div>
-                </div>
-                
-                <script type="text/javascript" src="https://s3.tradingview.com/tv.js"></script>
-                <script type="text/javascript">
-                  new TradingView.widget({{
-                    "autosize": true,
-                    "symbol": "{tradingview_symbol}",
-                    "interval": "5",
-                    "timezone": "America/New_York",
-                    "theme": "dark",
-                    "style": "{tv_style}",
-                    "locale": "en",
-                    "toolbar_bg": "#131722",
-                    "enable_publishing": false,
-                    "hide_top_toolbar": false,
-                    "withdateranges": true,
-                    "range": "1D",
-                    "hide_side_toolbar": false,
-                    "allow_symbol_change": true,
-                    "details": true,
-                    "hotlist": true,
-                    "calendar": true,
-                    "container_id": "tradingview_chart",
-                    "studies": {studies_json},
-                    "compare_symbols": {compare_json},
-                    "overrides": {json.dumps(overrides)}
-                  }});
-                </script>
-            </body>
-            </html>
-        """
+        tradingview_html = _tradingview_chart_html(
+            tradingview_symbol, tv_style, tuple(studies), tuple(compare_symbols_list)
+        )
         components.html(tradingview_html, height=720)
     
     with market_col:
@@ -1969,17 +3246,9 @@ def show_dashboard_page():
     st.subheader("🧠 AI Intelligence & Analysis")
     
     # Determine all display values
-    regime_colors = {
-        'TREND': '🟢',
-        'SIDEWAYS': '🟡', 
-        'VOLATILE': '🔴',
-        'Unknown': '⚪',
-        'Initializing...': '🔄'
-    }
-    
     # Current regime - show actual state from trading_state
     regime_display = trading_state.current_regime or "Unknown"
-    regime_icon = regime_colors.get(regime_display, '⚪')
+    regime_icon = _REGIME_ICONS.get(regime_display, '⚪')
     
     # Current strategy - show actual state from trading_state
     if trading_state.current_strategy in ['None', None]:
@@ -2006,852 +3275,136 @@ def show_dashboard_page():
     else:
         status_display = "🔍 Scanning"
         status_color = "#2196f3"
-        status_detail = "Analyzing for entry opportunities"
-    
-    # Initialize session state for detail views
-    if 'show_asset_details' not in st.session_state:
-        st.session_state.show_asset_details = False
-    if 'show_regime_details' not in st.session_state:
-        st.session_state.show_regime_details = False
-    if 'show_strategy_details' not in st.session_state:
-        st.session_state.show_strategy_details = False
-    if 'show_status_details' not in st.session_state:
-        st.session_state.show_status_details = False
-    
-    # Create button columns for headers
-    header_cols = st.columns(4)
-    
-    with header_cols[0]:
-        if st.button("📊 Asset", key="btn_asset", use_container_width=True):
-            st.session_state.show_asset_details = not st.session_state.show_asset_details
-            st.session_state.show_regime_details = False
-            st.session_state.show_strategy_details = False
-            st.session_state.show_status_details = False
-    
-    with header_cols[1]:
-        if st.button("🌊 Market Regime", key="btn_regime", use_container_width=True):
-            st.session_state.show_regime_details = not st.session_state.show_regime_details
-            st.session_state.show_asset_details = False
-            st.session_state.show_strategy_details = False
-            st.session_state.show_status_details = False
-    
-    with header_cols[2]:
-        if st.button("🎯 Strategy", key="btn_strategy", use_container_width=True):
-            st.session_state.show_strategy_details = not st.session_state.show_strategy_details
-            st.session_state.show_asset_details = False
-            st.session_state.show_regime_details = False
-            st.session_state.show_status_details = False
-    
-    with header_cols[3]:
-        if st.button("⚡ Status", key="btn_status", use_container_width=True):
-            st.session_state.show_status_details = not st.session_state.show_status_details
-            st.session_state.show_asset_details = False
-            st.session_state.show_regime_details = False
-            st.session_state.show_strategy_details = False
-    
-    # Data row - clean display without extra containers
-    st.markdown(f"""
-    <div style='background: linear-gradient(135deg, rgba(15, 12, 41, 0.95) 0%, rgba(26, 26, 46, 0.95) 100%); border-radius: 16px; padding: 24px; margin-top: 30px; border: 1px solid rgba(255, 255, 255, 0.1); box-shadow: 0 8px 32px rgba(0, 0, 0, 0.4);'>
-        <div style='display: grid; grid-template-columns: repeat(4, 1fr); gap: 20px; align-items: center;'>
-            <div style='text-align: center;'>
-                <p style='margin: 0; color: #ffffff; font-size: 20px; font-weight: 700;'>{selected_symbol}</p>
-                <p style='margin: 4px 0 0 0; color: #888; font-size: 12px;'>{asset_category}</p>
-            </div>
-            <div style='text-align: center;'>
-                <p style='margin: 0; color: #ffffff; font-size: 20px; font-weight: 700;'>{regime_icon} {regime_display}</p>
-                <p style='margin: 4px 0 0 0; color: #888; font-size: 12px;'>Real-time detection</p>
-            </div>
-            <div style='text-align: center;'>
-                <p style='margin: 0; color: #00d9ff; font-size: 20px; font-weight: 700;'>🎯 {strategy_display}</p>
-                <p style='margin: 4px 0 0 0; color: #888; font-size: 12px;'>Auto-selected</p>
-            </div>
-            <div style='text-align: center;'>
-                <p style='margin: 0; color: {status_color}; font-size: 20px; font-weight: 700;'>{status_display}</p>
-                <p style='margin: 4px 0 0 0; color: #888; font-size: 12px;'>{status_detail}</p>
-            </div>
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    # Show detailed view BELOW the table if any button was clicked
-    if any([st.session_state.show_asset_details, st.session_state.show_regime_details, 
-            st.session_state.show_strategy_details, st.session_state.show_status_details]):
-        
-        # Add explicit spacing before detailed view to separate from AI Intelligence table
-        st.markdown("<div style='height: 40px; width: 100%; clear: both;'></div>", unsafe_allow_html=True)
-    
-        # Show detailed information based on which button was clicked
-        if st.session_state.show_asset_details:
-            # Professional Asset Details with styled table
-            st.markdown(f"""
-            <div style='color: #00d9ff; font-size: 18px; font-weight: 700; margin-bottom: 20px; text-align: center;'>
-                📊 Asset Overview: {selected_symbol}
-            </div>
-            """, unsafe_allow_html=True)
-            
-            # Asset Information Table
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.markdown(f"""
-                <div style='background: rgba(0,217,255,0.1); border-radius: 8px; padding: 15px; border: 1px solid rgba(0,217,255,0.3);'>
-                    <p style='color: #00d9ff; font-size: 14px; font-weight: 600; margin: 0 0 10px 0;'>📋 ASSET DETAILS</p>
-                    <table style='width: 100%; color: #ffffff;'>
-                        <tr style='border-bottom: 1px solid rgba(255,255,255,0.1);'>
-                            <td style='padding: 8px 0; color: #888;'>Symbol:</td>
-                            <td style='padding: 8px 0; text-align: right; font-weight: 600;'>{selected_symbol}</td>
-                        </tr>
-                        <tr style='border-bottom: 1px solid rgba(255,255,255,0.1);'>
-                            <td style='padding: 8px 0; color: #888;'>Name:</td>
-                            <td style='padding: 8px 0; text-align: right; font-weight: 600;'>{selected_asset_name}</td>
-                        </tr>
-                        <tr style='border-bottom: 1px solid rgba(255,255,255,0.1);'>
-                            <td style='padding: 8px 0; color: #888;'>Category:</td>
-                            <td style='padding: 8px 0; text-align: right; font-weight: 600;'>{asset_category}</td>
-                        </tr>
-                        <tr>
-                            <td style='padding: 8px 0; color: #888;'>Exchange:</td>
-                            <td style='padding: 8px 0; text-align: right; font-weight: 600;'>{tradingview_symbol.split(':')[0]}</td>
-                        </tr>
-                    </table>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            with col2:
-                st.markdown(f"""
-                <div style='background: rgba(76,175,80,0.1); border-radius: 8px; padding: 15px; border: 1px solid rgba(76,175,80,0.3);'>
-                    <p style='color: #4caf50; font-size: 14px; font-weight: 600; margin: 0 0 10px 0;'>📈 MARKET PERFORMANCE</p>
-                    <p style='color: #ffffff; margin: 10px 0; font-size: 13px;'>Access comprehensive market data and live performance metrics:</p>
-                    <a href='https://www.google.com/finance/quote/{selected_symbol}:{'NASDAQ' if asset_category == 'Stocks' else 'INDEX'}' 
-                       target='_blank' 
-                       style='display: inline-block; background: linear-gradient(135deg, #4caf50, #45a049); 
-                              color: white; padding: 10px 20px; border-radius: 6px; text-decoration: none; 
-                              font-weight: 600; font-size: 13px; margin-top: 10px;'>
-                        🔗 View on Google Finance
-                    </a>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            # Current Analysis Section
-            st.markdown("""
-            <div style='background: rgba(33,150,243,0.1); border-radius: 8px; padding: 15px; margin-top: 15px; border: 1px solid rgba(33,150,243,0.3);'>
-                <p style='color: #2196f3; font-size: 14px; font-weight: 600; margin: 0 0 10px 0;'>🤖 AI ANALYSIS STATUS</p>
-            """, unsafe_allow_html=True)
-            
-            status_col1, status_col2, status_col3 = st.columns(3)
-            
-            with status_col1:
-                st.markdown("""
-                <div style='text-align: center; padding: 10px;'>
-                    <div style='font-size: 24px; margin-bottom: 5px;'>✅</div>
-                    <div style='color: #4caf50; font-weight: 600; font-size: 12px;'>Price Tracking</div>
-                    <div style='color: #888; font-size: 11px;'>Real-time</div>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            with status_col2:
-                st.markdown("""
-                <div style='text-align: center; padding: 10px;'>
-                    <div style='font-size: 24px; margin-bottom: 5px;'>✅</div>
-                    <div style='color: #4caf50; font-weight: 600; font-size: 12px;'>Technical Indicators</div>
-                    <div style='color: #888; font-size: 11px;'>Active</div>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            with status_col3:
-                st.markdown("""
-                <div style='text-align: center; padding: 10px;'>
-                    <div style='font-size: 24px; margin-bottom: 5px;'>✅</div>
-                    <div style='color: #4caf50; font-weight: 600; font-size: 12px;'>Volume Analysis</div>
-                    <div style='color: #888; font-size: 11px;'>Monitoring</div>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            st.markdown("</div>", unsafe_allow_html=True)
-            
-            # Why This Asset Section
-            st.markdown(f"""
-            <div style='background: rgba(255,152,0,0.1); border-radius: 8px; padding: 15px; margin-top: 15px; border: 1px solid rgba(255,152,0,0.3);'>
-                <p style='color: #ff9800; font-size: 14px; font-weight: 600; margin: 0 0 10px 0;'>💡 WHY THIS ASSET?</p>
-                <p style='color: #ffffff; margin: 0; font-size: 13px; line-height: 1.6;'>
-                    <strong>{selected_symbol}</strong> was selected based on your configuration settings. 
-                    The AI continuously monitors price action, trading volume, and multiple technical indicators 
-                    to identify optimal entry and exit opportunities. This asset is being analyzed in real-time 
-                    to detect high-probability trading setups that align with current market conditions.
-                </p>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        elif st.session_state.show_regime_details:
-            regime_info = {
-                'TREND': {
-                    'description': 'Strong directional movement in prices',
-                    'characteristics': '• Clear price direction\n• Higher highs or lower lows\n• Sustained momentum',
-                    'best_for': 'Trend Following strategies work best',
-                    'risk': 'Medium - Follow the trend, avoid fighting it'
-                },
-                'SIDEWAYS': {
-                    'description': 'Price consolidation within a range',
-                    'characteristics': '• Limited price movement\n• Support and resistance levels\n• Low volatility',
-                    'best_for': 'Mean Reversion strategies excel here',
-                    'risk': 'Low - Predictable range-bound movement'
-                },
-                'VOLATILE': {
-                    'description': 'High price fluctuations and uncertainty',
-                    'characteristics': '• Rapid price swings\n• Increased volume\n• Breakout potential',
-                    'best_for': 'Volatility Breakout strategies thrive',
-                    'risk': 'High - Requires careful position sizing'
-                },
-                'Unknown': {
-                    'description': 'Insufficient data for classification',
-                    'characteristics': '• Collecting market data\n• Building price history\n• Analyzing patterns',
-                    'best_for': 'Waiting for clear market structure',
-                    'risk': 'N/A - System initializing'
-                }
-            }
-            
-            current_regime_info = regime_info.get(regime_display, regime_info['Unknown'])
-            
-            # Professional Market Regime Details
-            st.markdown(f"""
-            <div style='color: #4cafff; font-size: 18px; font-weight: 700; margin-bottom: 20px; text-align: center;'>
-                🌊 Market Regime Analysis: {regime_icon} {regime_display}
-            </div>
-            """, unsafe_allow_html=True)
-            
-            # Regime Overview
-            st.markdown(f"""
-            <div style='background: rgba(76,175,254,0.1); border-radius: 8px; padding: 20px; border: 1px solid rgba(76,175,254,0.3); margin-bottom: 15px;'>
-                <p style='color: #4cafff; font-size: 16px; font-weight: 600; margin: 0 0 10px 0; text-align: center;'>
-                    {regime_icon} Current Market Condition
-                </p>
-                <p style='color: #ffffff; margin: 0; font-size: 14px; text-align: center; line-height: 1.6;'>
-                    {current_regime_info['description']}
-                </p>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            # Two-column layout for characteristics and strategy
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                characteristics_lines = current_regime_info['characteristics'].split('\n')
-                characteristics_html = '<br>'.join([f"<div style='padding: 5px 0;'>{line}</div>" for line in characteristics_lines])
-                
-                st.markdown(f"""
-                <div style='background: rgba(33,150,243,0.1); border-radius: 8px; padding: 15px; border: 1px solid rgba(33,150,243,0.3); height: 100%;'>
-                    <p style='color: #2196f3; font-size: 14px; font-weight: 600; margin: 0 0 10px 0;'>📋 KEY CHARACTERISTICS</p>
-                    <div style='color: #ffffff; font-size: 13px; line-height: 1.8;'>
-                        {characteristics_html}
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            with col2:
-                st.markdown(f"""
-                <div style='background: rgba(76,175,80,0.1); border-radius: 8px; padding: 15px; border: 1px solid rgba(76,175,80,0.3); height: 100%;'>
-                    <p style='color: #4caf50; font-size: 14px; font-weight: 600; margin: 0 0 10px 0;'>🎯 OPTIMAL STRATEGY</p>
-                    <p style='color: #ffffff; margin: 0; font-size: 13px; line-height: 1.8;'>
-                        {current_regime_info['best_for']}
-                    </p>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            # Risk Level and AI Detection
-            risk_colors = {'LOW': '#4caf50', 'MEDIUM': '#ff9800', 'HIGH': '#f44336', 'N/A': '#888'}
-            risk_word = current_regime_info['risk'].split(' - ')[0].split(': ')[-1] if ' - ' in current_regime_info['risk'] else 'MEDIUM'
-            risk_color = risk_colors.get(risk_word.upper(), '#ff9800')
-            
-            st.markdown(f"""
-            <div style='background: rgba(255,152,0,0.1); border-radius: 8px; padding: 15px; margin-top: 15px; border: 1px solid rgba(255,152,0,0.3);'>
-                <p style='color: #ff9800; font-size: 14px; font-weight: 600; margin: 0 0 10px 0;'>⚠️ RISK ASSESSMENT</p>
-                <p style='color: {risk_color}; margin: 0; font-size: 14px; font-weight: 600;'>
-                    {current_regime_info['risk']}
-                </p>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            st.markdown(f"""
-            <div style='background: rgba(156,39,176,0.1); border-radius: 8px; padding: 15px; margin-top: 15px; border: 1px solid rgba(156,39,176,0.3);'>
-                <p style='color: #9c27b0; font-size: 14px; font-weight: 600; margin: 0 0 10px 0;'>🤖 AI DETECTION METHOD</p>
-                <p style='color: #ffffff; margin: 0; font-size: 13px; line-height: 1.6;'>
-                    The AI uses machine learning algorithms to analyze price patterns, volatility, and momentum 
-                    to classify market conditions in real-time. This enables automatic strategy selection 
-                    that adapts to changing market dynamics.
-                </p>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        elif st.session_state.show_strategy_details:
-            strategy_info = {
-                'Trend Following': {
-                    'description': 'Captures sustained directional moves',
-                    'logic': 'Identifies and follows strong trends using moving averages and momentum indicators',
-                    'indicators': '• EMA (20/50 periods)\n• MACD\n• ADX for trend strength',
-                    'entry': 'When price crosses above EMA and MACD confirms',
-                    'exit': 'When trend reverses or momentum weakens',
-                    'best_in': 'TREND markets',
-                    'advantage': 'High reward potential in strong trends'
-                    },
-                'Mean Reversion': {
-                    'description': 'Profits from price returning to average',
-                    'logic': 'Identifies overbought/oversold conditions and trades reversals back to mean',
-                    'indicators': '• Bollinger Bands\n• RSI\n• Standard deviation',
-                    'entry': 'When price reaches extreme levels (oversold/overbought)',
-                    'exit': 'When price returns to moving average',
-                    'best_in': 'SIDEWAYS markets',
-                    'advantage': 'Consistent profits in range-bound conditions'
-                },
-                'Volatility Breakout': {
-                    'description': 'Captures explosive price movements',
-                    'logic': 'Detects compression followed by expansion, trading the breakout',
-                    'indicators': '• ATR (Average True Range)\n• Donchian Channels\n• Volume spikes',
-                    'entry': 'When price breaks out of consolidation with volume',
-                    'exit': 'When volatility contracts or breakout fails',
-                    'best_in': 'VOLATILE markets',
-                    'advantage': 'Large moves in short timeframes'
-                },
-                'Analyzing...': {
-                    'description': 'AI is evaluating market conditions',
-                    'logic': 'Analyzing historical data and current market regime',
-                    'indicators': '• Collecting price data\n• Calculating indicators\n• Detecting patterns',
-                    'entry': 'Waiting for strategy selection',
-                    'exit': 'Pending analysis completion',
-                    'best_in': 'Initializing...',
-                    'advantage': 'Ensuring optimal strategy selection'
-                },
-                'None': {
-                    'description': 'No strategy selected - system stopped',
-                    'logic': 'Start trading to enable AI strategy selection',
-                    'indicators': '• System idle',
-                    'entry': 'N/A',
-                    'exit': 'N/A',
-                    'best_in': 'N/A',
-                    'advantage': 'Safe mode - no active trading'
-                }
-            }
-            
-            current_strategy_info = strategy_info.get(strategy_display, strategy_info['None'])
-            
-            # Professional Strategy Details
-            st.markdown(f"""
-            <div style='color: #ffc107; font-size: 18px; font-weight: 700; margin-bottom: 20px; text-align: center;'>
-                🎯 Strategy Deep Dive: {strategy_display}
-            </div>
-            """, unsafe_allow_html=True)
-            
-            # Strategy Overview
-            st.markdown(f"""
-            <div style='background: rgba(255,193,7,0.1); border-radius: 8px; padding: 20px; border: 1px solid rgba(255,193,7,0.3); margin-bottom: 15px;'>
-                <p style='color: #ffc107; font-size: 16px; font-weight: 600; margin: 0 0 10px 0; text-align: center;'>
-                    💡 Strategy Overview
-                </p>
-                <p style='color: #ffffff; margin: 0; font-size: 14px; text-align: center; line-height: 1.6;'>
-                    {current_strategy_info['description']}
-                </p>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            # How It Works
-            st.markdown(f"""
-            <div style='background: rgba(33,150,243,0.1); border-radius: 8px; padding: 15px; border: 1px solid rgba(33,150,243,0.3); margin-bottom: 15px;'>
-                <p style='color: #2196f3; font-size: 14px; font-weight: 600; margin: 0 0 10px 0;'>🔍 HOW IT WORKS</p>
-                <p style='color: #ffffff; margin: 0; font-size: 13px; line-height: 1.6;'>
-                    {current_strategy_info['logic']}
-                </p>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            # Key Indicators
-            indicators_lines = current_strategy_info['indicators'].split('\n')
-            indicators_html = '<br>'.join([f"<div style='padding: 5px 0;'>{line}</div>" for line in indicators_lines])
-            
-            st.markdown(f"""
-            <div style='background: rgba(156,39,176,0.1); border-radius: 8px; padding: 15px; border: 1px solid rgba(156,39,176,0.3); margin-bottom: 15px;'>
-                <p style='color: #9c27b0; font-size: 14px; font-weight: 600; margin: 0 0 10px 0;'>� KEY INDICATORS</p>
-                <div style='color: #ffffff; font-size: 13px; line-height: 1.8;'>
-                    {indicators_html}
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            # Entry and Exit Conditions in two columns
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.markdown(f"""
-                <div style='background: rgba(76,175,80,0.1); border-radius: 8px; padding: 15px; border: 1px solid rgba(76,175,80,0.3); height: 100%;'>
-                    <p style='color: #4caf50; font-size: 14px; font-weight: 600; margin: 0 0 10px 0;'>🟢 ENTRY CONDITIONS</p>
-                    <p style='color: #ffffff; margin: 0; font-size: 13px; line-height: 1.6;'>
-                        {current_strategy_info['entry']}
-                    </p>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            with col2:
-                st.markdown(f"""
-                <div style='background: rgba(244,67,54,0.1); border-radius: 8px; padding: 15px; border: 1px solid rgba(244,67,54,0.3); height: 100%;'>
-                    <p style='color: #f44336; font-size: 14px; font-weight: 600; margin: 0 0 10px 0;'>🔴 EXIT CONDITIONS</p>
-                    <p style='color: #ffffff; margin: 0; font-size: 13px; line-height: 1.6;'>
-                        {current_strategy_info['exit']}
-                    </p>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            # Best Performance and Advantage
-            st.markdown(f"""
-            <div style='background: rgba(0,188,212,0.1); border-radius: 8px; padding: 15px; margin-top: 15px; border: 1px solid rgba(0,188,212,0.3);'>
-                <p style='color: #00bcd4; font-size: 14px; font-weight: 600; margin: 0 0 10px 0;'>✨ BEST PERFORMANCE</p>
-                <p style='color: #ffffff; margin: 0; font-size: 13px; line-height: 1.6;'>
-                    This strategy excels in <strong>{current_strategy_info['best_in']}</strong>
-                </p>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            st.markdown(f"""
-            <div style='background: rgba(255,152,0,0.1); border-radius: 8px; padding: 15px; margin-top: 15px; border: 1px solid rgba(255,152,0,0.3);'>
-                <p style='color: #ff9800; font-size: 14px; font-weight: 600; margin: 0 0 10px 0;'>💪 COMPETITIVE ADVANTAGE</p>
-                <p style='color: #ffffff; margin: 0; font-size: 13px; line-height: 1.6;'>
-                    {current_strategy_info['advantage']}
-                </p>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            # Why AI Selected This
-            st.markdown(f"""
-            <div style='background: rgba(0,217,255,0.1); border-radius: 8px; padding: 15px; margin-top: 15px; border: 1px solid rgba(0,217,255,0.3);'>
-                <p style='color: #00d9ff; font-size: 14px; font-weight: 600; margin: 0 0 10px 0;'>🤖 WHY AI SELECTED THIS</p>
-                <p style='color: #ffffff; margin: 0; font-size: 13px; line-height: 1.6;'>
-                    The AI automatically chooses the most suitable strategy based on current market regime. 
-                    This ensures you're always trading with the optimal approach for current conditions, 
-                    maximizing your probability of success.
-                </p>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        elif st.session_state.show_status_details:
-            
-            if not trading_state.running:
-                # Professional Status Details - System Stopped (Combined with rotation)
-                st.markdown("""
-                <div id="status-container" style="background: linear-gradient(135deg, rgba(15, 12, 41, 0.95) 0%, rgba(26, 26, 46, 0.95) 100%); border-radius: 16px; padding: 30px; border: 1px solid rgba(255, 255, 255, 0.1); box-shadow: 0 8px 32px rgba(0, 0, 0, 0.4); min-height: 200px; position: relative; overflow: hidden; margin-top: 20px; margin-bottom: 40px;">
-                    <div class="status-section active" style="color: #888; font-size: 18px; font-weight: 700; margin-bottom: 15px; text-align: center; transition: opacity 0.5s ease;">
-                        ⚪ System Status: Inactive
-                    </div>
-                    <div class="status-section" style="background: rgba(108,117,125,0.1); border-radius: 12px; padding: 20px; border: 1px solid rgba(108,117,125,0.3); margin-bottom: 15px; opacity: 0; position: absolute; width: calc(100% - 60px); transition: opacity 0.5s ease; top: 60px; left: 30px;">
-                        <p style="color: #6c757d; font-size: 16px; font-weight: 600; margin: 0 0 10px 0; text-align: center;">⚪ Trading System Inactive</p>
-                        <p style="color: #ffffff; margin: 0; font-size: 14px; text-align: center; line-height: 1.6;">The trading system is currently not running. Start trading to activate AI analysis and signal detection.</p>
-                    </div>
-                    <div class="status-section" style="background: rgba(0,217,255,0.1); border-radius: 12px; padding: 20px; border: 1px solid rgba(0,217,255,0.3); margin-bottom: 15px; opacity: 0; position: absolute; width: calc(100% - 60px); transition: opacity 0.5s ease; top: 60px; left: 30px;">
-                        <p style="color: #00d9ff; font-size: 16px; font-weight: 600; margin: 0 0 15px 0; text-align: center;">🚀 HOW TO START</p>
-                        <div style="color: #ffffff; font-size: 14px; line-height: 1.8;">
-                            <div style="padding: 8px 0;"><strong>1.</strong> Click the <strong>Start Trading</strong> button above</div>
-                            <div style="padding: 8px 0;"><strong>2.</strong> System will connect to live market data</div>
-                            <div style="padding: 8px 0;"><strong>3.</strong> AI will begin analysis within 1-2 minutes</div>
-                        </div>
-                    </div>
-                    <div class="status-section" style="background: rgba(76,175,80,0.1); border-radius: 12px; padding: 20px; border: 1px solid rgba(76,175,80,0.3); opacity: 0; position: absolute; width: calc(100% - 60px); transition: opacity 0.5s ease; top: 60px; left: 30px;">
-                        <p style="color: #4caf50; font-size: 16px; font-weight: 600; margin: 0 0 15px 0; text-align: center;">🛡️ SAFETY FEATURES</p>
-                        <div style="color: #ffffff; font-size: 14px; line-height: 1.8;">
-                            <div style="padding: 8px 0;">✅ Paper trading enabled by default</div>
-                            <div style="padding: 8px 0;">✅ Risk management active</div>
-                            <div style="padding: 8px 0;">✅ Stop-loss protection ready</div>
-                        </div>
-                    </div>
-                </div>
-                <script>
-                (function() {
-                    const container = document.getElementById('status-container');
-                    if (!container) return;
-                    const sections = container.querySelectorAll('.status-section');
-                    let currentIndex = 0;
-                    sections.forEach((section, index) => {
-                        if (index === 0) {
-                            section.style.opacity = '1';
-                            section.style.position = 'relative';
-                        } else {
-                            section.style.opacity = '0';
-                            section.style.position = 'absolute';
-                            section.style.top = '60px';
-                            section.style.left = '30px';
-                        }
-                    });
-                    function rotateStatus() {
-                        sections[currentIndex].style.opacity = '0';
-                        sections[currentIndex].style.position = 'absolute';
-                        sections[currentIndex].style.top = '60px';
-                        sections[currentIndex].style.left = '30px';
-                        currentIndex = (currentIndex + 1) % sections.length;
-                        sections[currentIndex].style.opacity = '1';
-                        sections[currentIndex].style.position = 'relative';
-                    }
-                    setInterval(rotateStatus, 7000);
-                })();
-                </script>
-                """, unsafe_allow_html=True)
-            elif trading_state.current_regime == "Initializing...":
-                # Professional Status Details - Initializing (Static Display)
-                st.markdown("""
-                <div style='color: #00d9ff; font-size: 18px; font-weight: 700; margin-bottom: 20px; text-align: center;'>
-                    🔄 System Status: Initializing
-                </div>
-                """, unsafe_allow_html=True)
-                
-                st.markdown(f"""
-                <div style='background: rgba(0,217,255,0.1); border-radius: 8px; padding: 20px; border: 1px solid rgba(0,217,255,0.3); margin-bottom: 15px;'>
-                    <p style='color: #00d9ff; font-size: 16px; font-weight: 600; margin: 0 0 10px 0; text-align: center;'>
-                        🔄 Initializing AI Intelligence
-                    </p>
-                    <p style='color: #ffffff; margin: 0; font-size: 14px; text-align: center; line-height: 1.6;'>
-                        Collecting live market data for <strong>{selected_symbol}</strong> and preparing analysis algorithms...
-                    </p>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                # Progress Checklist
-                st.markdown("""
-                <div style='background: rgba(33,150,243,0.1); border-radius: 8px; padding: 15px; border: 1px solid rgba(33,150,243,0.3); margin-bottom: 15px;'>
-                    <p style='color: #2196f3; font-size: 14px; font-weight: 600; margin: 0 0 10px 0;'>📊 PROGRESS STATUS</p>
-                    <div style='color: #ffffff; font-size: 13px; line-height: 1.8;'>
-                        <div style='padding: 5px 0;'>✅ Connected to market feed</div>
-                        <div style='padding: 5px 0;'>🔄 Building price history (20+ bars needed)</div>
-                        <div style='padding: 5px 0;'>⏳ Preparing regime detection</div>
-                        <div style='padding: 5px 0;'>⏳ Loading strategy algorithms</div>
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                # Estimated Time
-                st.markdown("""
-                <div style='background: rgba(255,152,0,0.1); border-radius: 8px; padding: 15px; border: 1px solid rgba(255,152,0,0.3);'>
-                    <p style='color: #ff9800; font-size: 14px; font-weight: 600; margin: 0 0 10px 0;'>⏱️ ESTIMATED TIME</p>
-                    <p style='color: #ffffff; margin: 0; font-size: 13px; line-height: 1.6;'>
-                        <strong>1-2 minutes</strong> - This is a one-time setup. Once complete, 
-                        analysis will run continuously in real-time!
-                    </p>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                # Add animated progress
-                st.markdown("""
-                <div style='text-align: center; padding: 30px 20px;'>
-                    <div style='display: inline-block; font-size: 50px; animation: pulse 1.5s ease-in-out infinite;'>
-                        🔄
-                    </div>
-                    <p style='color: #00d9ff; margin-top: 15px; font-weight: 600; font-size: 16px;'>Initializing...</p>
-                </div>
-                <style>
-                    @keyframes pulse {{
-                        0%, 100% {{ transform: scale(1); opacity: 1; }}
-                        50% {{ transform: scale(1.1); opacity: 0.7; }}
-                    }}
-                </style>
-                """, unsafe_allow_html=True)
-            elif trading_state.position_state == 'long':
-                # Professional Status Details - Position Active
-                st.markdown(f"""
-                <div style='color: #4caf50; font-size: 18px; font-weight: 700; margin-bottom: 20px; text-align: center;'>
-                    ✅ System Status: Position Active
-                </div>
-                """, unsafe_allow_html=True)
-                
-                st.markdown(f"""
-                <div style='background: rgba(76,175,80,0.1); border-radius: 8px; padding: 20px; border: 1px solid rgba(76,175,80,0.3); margin-bottom: 15px;'>
-                    <p style='color: #4caf50; font-size: 16px; font-weight: 600; margin: 0 0 10px 0; text-align: center;'>
-                        ✅ LONG Position Active on {selected_symbol}
-                    </p>
-                    <p style='color: #ffffff; margin: 0; font-size: 14px; text-align: center; line-height: 1.6;'>
-                        You have an active long position. AI is continuously monitoring for optimal exit signals.
-                    </p>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                # AI Monitoring
-                st.markdown("""
-                <div style='background: rgba(0,217,255,0.1); border-radius: 8px; padding: 15px; border: 1px solid rgba(0,217,255,0.3); margin-bottom: 15px;'>
-                    <p style='color: #00d9ff; font-size: 14px; font-weight: 600; margin: 0 0 10px 0;'>🤖 AI MONITORING</p>
-                    <div style='color: #ffffff; font-size: 13px; line-height: 1.8;'>
-                        <div style='padding: 5px 0;'>📊 Tracking price movements in real-time</div>
-                        <div style='padding: 5px 0;'>🎯 Analyzing exit signals continuously</div>
-                        <div style='padding: 5px 0;'>🛡️ Stop-loss protection active</div>
-                        <div style='padding: 5px 0;'>⏱️ Updates every 3 seconds</div>
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                # What AI Is Watching
-                st.markdown("""
-                <div style='background: rgba(255,152,0,0.1); border-radius: 8px; padding: 15px; border: 1px solid rgba(255,152,0,0.3); margin-bottom: 15px;'>
-                    <p style='color: #ff9800; font-size: 14px; font-weight: 600; margin: 0 0 10px 0;'>👁️ WHAT AI IS WATCHING</p>
-                    <div style='color: #ffffff; font-size: 13px; line-height: 1.8;'>
-                        <div style='padding: 5px 0;'>• Trend reversal signals</div>
-                        <div style='padding: 5px 0;'>• Momentum weakening</div>
-                        <div style='padding: 5px 0;'>• Support level breaks</div>
-                        <div style='padding: 5px 0;'>• Volume changes</div>
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                # Notification Alert
-                st.markdown("""
-                <div style='background: rgba(33,150,243,0.1); border-radius: 8px; padding: 15px; border: 1px solid rgba(33,150,243,0.3);'>
-                    <p style='color: #2196f3; font-size: 14px; font-weight: 600; margin: 0 0 10px 0;'>🔔 YOU'LL BE NOTIFIED WHEN</p>
-                    <p style='color: #ffffff; margin: 0; font-size: 13px; line-height: 1.6;'>
-                        The AI detects optimal exit conditions to protect profits or minimize losses. 
-                        Exit signals will appear prominently when conditions are met.
-                    </p>
-                </div>
-                """, unsafe_allow_html=True)
-            else:
-                # Professional Status Details - Scanning (Unified Full Box)
-                
-                # Animated Status Switcher - cycles every 10 seconds
-                current_time = int(time.time())
-                cycle_index = (current_time // 10) % 6  # 6 status items, switch every 10 seconds
-                
-                # Define all status items
-                status_items = [
-                    {
-                        'icon': '🔍',
-                        'label': 'Scanning Status',
-                        'content': f'AI actively analyzing <strong>{selected_symbol}</strong> for high-probability entry signals'
-                    },
-                    {
-                        'icon': '📊',
-                        'label': 'Monitoring',
-                        'content': 'Price action analyzed every minute with 3-second updates'
-                    },
-                    {
-                        'icon': '🧠',
-                        'label': 'Market Regime',
-                        'content': f'Evaluating <strong>{regime_display}</strong> market conditions'
-                    },
-                    {
-                        'icon': '🎯',
-                        'label': 'Active Strategy',
-                        'content': f'Using <strong>{strategy_display}</strong> strategy'
-                    },
-                    {
-                        'icon': '🎯',
-                        'label': 'Looking For',
-                        'content': 'Optimal entry points • Risk/reward setups • Multi-indicator confirmation • Volume validation'
-                    },
-                    {
-                        'icon': '🔔',
-                        'label': 'Alert Status',
-                        'content': 'Ready to notify when strong buy signals detected with high confidence'
-                    }
-                ]
-                
-                # Get current status item
-                current_status = status_items[cycle_index]
-                
-                # Build progress dots
-                dot_color_0 = "#2196f3" if cycle_index == 0 else "rgba(33,150,243,0.3)"
-                dot_color_1 = "#2196f3" if cycle_index == 1 else "rgba(33,150,243,0.3)"
-                dot_color_2 = "#2196f3" if cycle_index == 2 else "rgba(33,150,243,0.3)"
-                dot_color_3 = "#2196f3" if cycle_index == 3 else "rgba(33,150,243,0.3)"
-                dot_color_4 = "#2196f3" if cycle_index == 4 else "rgba(33,150,243,0.3)"
-                dot_color_5 = "#2196f3" if cycle_index == 5 else "rgba(33,150,243,0.3)"
-                
-                # Build the animated status display - UNIFIED FULL BOX with same gradient throughout
-                st.markdown(f"""
-                <style>
-                    @keyframes fadeIn {{
-                        from {{ opacity: 0; transform: translateY(-10px); }}
-                        to {{ opacity: 1; transform: translateY(0); }}
-                    }}
-                </style>
-                <div style='background: linear-gradient(135deg, rgba(33,150,243,0.15) 0%, rgba(0,217,255,0.15) 100%); 
-                            border-radius: 12px; padding: 30px; border: 2px solid rgba(33,150,243,0.4); 
-                            box-shadow: 0 4px 15px rgba(0,0,0,0.3); animation: fadeIn 0.5s ease-in;'>
-                    <div style='text-align: center; margin-bottom: 25px;'>
-                        <p style='color: #2196f3; font-size: 18px; font-weight: 700; margin: 0;'>🔍 AI SCANNING STATUS</p>
-                        <p style='color: #ffffff; margin: 8px 0 0 0; font-size: 13px; opacity: 0.9;'>Real-time market analysis and signal detection</p>
-                    </div>
-                    <div style='text-align: center; margin-bottom: 25px;'>
-                        <div style='margin-bottom: 15px;'>
-                            <span style='font-size: 48px;'>{current_status['icon']}</span>
-                        </div>
-                        <div style='margin-bottom: 12px;'>
-                            <span style='color: #2196f3; font-weight: 700; font-size: 18px;'>{current_status['label']}</span>
-                        </div>
-                        <div style='max-width: 600px; margin: 0 auto;'>
-                            <span style='color: #ffffff; font-size: 15px; line-height: 1.8;'>{current_status['content']}</span>
-                        </div>
-                    </div>
-                    <div style='display: flex; justify-content: center; gap: 10px; margin-top: 20px;'>
-                        <div style='width: 10px; height: 10px; border-radius: 50%; background: {dot_color_0}; transition: all 0.3s ease;'></div>
-                        <div style='width: 10px; height: 10px; border-radius: 50%; background: {dot_color_1}; transition: all 0.3s ease;'></div>
-                        <div style='width: 10px; height: 10px; border-radius: 50%; background: {dot_color_2}; transition: all 0.3s ease;'></div>
-                        <div style='width: 10px; height: 10px; border-radius: 50%; background: {dot_color_3}; transition: all 0.3s ease;'></div>
-                        <div style='width: 10px; height: 10px; border-radius: 50%; background: {dot_color_4}; transition: all 0.3s ease;'></div>
-                        <div style='width: 10px; height: 10px; border-radius: 50%; background: {dot_color_5}; transition: all 0.3s ease;'></div>
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                # AI 5-Minute Analysis (NEW FEATURE)
-                if 'bar_history' in st.session_state and selected_symbol in st.session_state.bar_history:
-                    bars = st.session_state.bar_history[selected_symbol]
-                    
-                    if len(bars) >= 5:  # Need at least 5 bars for analysis
-                        # Get last 5 bars for 5-minute analysis
-                        recent_bars = bars[-5:]
-                        
-                        # Calculate price movement
-                        first_price = recent_bars[0]['c']
-                        last_price = recent_bars[-1]['c']
-                        price_change = ((last_price - first_price) / first_price) * 100
-                        
-                        # Calculate volume trend
-                        avg_volume = sum(bar.get('v', 0) for bar in recent_bars) / len(recent_bars)
-                        latest_volume = recent_bars[-1].get('v', 0)
-                        volume_trend = "increasing" if latest_volume > avg_volume else "decreasing"
-                        
-                        # Determine trend direction
-                        if price_change > 0.5:
-                            trend_direction = "📈 Upward"
-                            trend_color = "#4caf50"
-                            trend_bg = "rgba(76,175,80,0.1)"
-                            trend_border = "rgba(76,175,80,0.3)"
-                        elif price_change < -0.5:
-                            trend_direction = "📉 Downward"
-                            trend_color = "#f44336"
-                            trend_bg = "rgba(244,67,54,0.1)"
-                            trend_border = "rgba(244,67,54,0.3)"
-                        else:
-                            trend_direction = "➡️ Sideways"
-                            trend_color = "#ff9800"
-                            trend_bg = "rgba(255,152,0,0.1)"
-                            trend_border = "rgba(255,152,0,0.3)"
-                        
-                        # Generate AI analysis message
-                        if price_change > 0.5:
-                            if regime_display == "TREND":
-                                signal_assessment = "✅ BULLISH SIGNAL"
-                                signal_color = "#4caf50"
-                                reasoning = f"Price is rising (+{price_change:.2f}%) in a <strong>TREND</strong> market. This aligns with our {strategy_display} strategy. Volume is {volume_trend}, confirming momentum."
-                                recommendation = "💡 <strong>This could be a good opportunity to BUY</strong> if entry conditions are fully met. Monitor for confirmation signals."
-                            else:
-                                signal_assessment = "⚠️ CAUTION"
-                                signal_color = "#ff9800"
-                                reasoning = f"Price is rising (+{price_change:.2f}%) but market regime is <strong>{regime_display}</strong>. Current conditions may not sustain upward movement."
-                                recommendation = "💡 <strong>Wait for better setup.</strong> Price rise in non-trending markets often leads to reversals."
-                        elif price_change < -0.5:
-                            if regime_display == "SIDEWAYS" and strategy_display == "Mean Reversion":
-                                signal_assessment = "✅ POTENTIAL OPPORTUNITY"
-                                signal_color = "#4caf50"
-                                reasoning = f"Price dropped ({price_change:.2f}%) in a <strong>SIDEWAYS</strong> market. Mean reversion strategy may find entry as price approaches support."
-                                recommendation = "💡 <strong>Monitor for bounce signals</strong> near support levels. This could present a buying opportunity."
-                            else:
-                                signal_assessment = "🛑 BEARISH SIGNAL"
-                                signal_color = "#f44336"
-                                reasoning = f"Price is falling ({price_change:.2f}%) with {volume_trend} volume. Current {strategy_display} strategy suggests caution."
-                                recommendation = "💡 <strong>NOT a good time to BUY.</strong> Wait for price stabilization or trend reversal confirmation."
-                        else:
-                            signal_assessment = "⏸️ NEUTRAL"
-                            signal_color = "#888"
-                            reasoning = f"Price movement is minimal ({price_change:+.2f}%) over the last 5 minutes. Market is consolidating."
-                            recommendation = "💡 <strong>No clear signal yet.</strong> Waiting for more decisive price action before suggesting entry."
-                        
-                        # Display AI 5-Minute Analysis
-                        st.markdown(f"""
-                        <div style='background: {trend_bg}; border-radius: 8px; padding: 15px; border: 1px solid {trend_border}; margin-bottom: 15px;'>
-                            <p style='color: {trend_color}; font-size: 14px; font-weight: 600; margin: 0 0 10px 0;'>🧠 AI 5-MINUTE ANALYSIS</p>
-                            <div style='color: #ffffff; font-size: 13px; line-height: 1.8;'>
-                                <div style='padding: 5px 0;'><strong>Price Movement:</strong> {trend_direction} ({price_change:+.2f}%)</div>
-                                <div style='padding: 5px 0;'><strong>Current Price:</strong> ${last_price:.2f}</div>
-                                <div style='padding: 5px 0;'><strong>Volume Trend:</strong> {volume_trend.capitalize()}</div>
-                                <div style='padding: 5px 0; margin-top: 10px;'><span style='color: {signal_color}; font-weight: 600;'>{signal_assessment}</span></div>
-                                <div style='padding: 5px 0; margin-top: 5px; background: rgba(0,0,0,0.2); border-radius: 4px; padding: 10px;'>
-                                    {reasoning}
-                                </div>
-                            </div>
-                        </div>
-                        """, unsafe_allow_html=True)
-                        
-                        # AI Recommendation Box
-                        st.markdown(f"""
-                        <div style='background: rgba(0,217,255,0.1); border-radius: 8px; padding: 15px; border: 1px solid rgba(0,217,255,0.3); margin-bottom: 15px;'>
-                            <p style='color: #00d9ff; font-size: 14px; font-weight: 600; margin: 0 0 10px 0;'>🎯 AI RECOMMENDATION</p>
-                            <p style='color: #ffffff; margin: 0; font-size: 13px; line-height: 1.6;'>
-                                {recommendation}
-                            </p>
-                        </div>
-                        """, unsafe_allow_html=True)
-                
-                # Add scanning animation
-                st.markdown("""
-                <div style='text-align: center; padding: 30px 20px;'>
-                    <div style='display: inline-block; font-size: 50px; animation: scan 2s linear infinite;'>
-                        🔍
-                    </div>
-                    <p style='color: #2196f3; margin-top: 15px; font-weight: 600; font-size: 16px;'>Actively Scanning...</p>
-                </div>
-                <style>
-                    @keyframes scan {
-                        0% { transform: translateX(-20px); }
-                        50% { transform: translateX(20px); }
-                        100% { transform: translateX(-20px); }
-                    }
-                </style>
-                """, unsafe_allow_html=True)
+        status_detail = "Analyzing for entry opportunities"
+    
+    # Initialize session state for detail views
+    if 'show_asset_details' not in st.session_state:
+        st.session_state.show_asset_details = False
+    if 'show_regime_details' not in st.session_state:
+        st.session_state.show_regime_details = False
+    if 'show_strategy_details' not in st.session_state:
+        st.session_state.show_strategy_details = False
+    if 'show_status_details' not in st.session_state:
+        st.session_state.show_status_details = False
+    
+    # Create button columns for headers
+    header_cols = st.columns(4)
+    
+    with header_cols[0]:
+        if st.button("📊 Asset", key="btn_asset", use_container_width=True):
+            st.session_state.show_asset_details = not st.session_state.show_asset_details
+            st.session_state.show_regime_details = False
+            st.session_state.show_strategy_details = False
+            st.session_state.show_status_details = False
+    
+    with header_cols[1]:
+        if st.button("🌊 Market Regime", key="btn_regime", use_container_width=True):
+            st.session_state.show_regime_details = not st.session_state.show_regime_details
+            st.session_state.show_asset_details = False
+            st.session_state.show_strategy_details = False
+            st.session_state.show_status_details = False
+    
+    with header_cols[2]:
+        if st.button("🎯 Strategy", key="btn_strategy", use_container_width=True):
+            st.session_state.show_strategy_details = not st.session_state.show_strategy_details
+            st.session_state.show_asset_details = False
+            st.session_state.show_regime_details = False
+            st.session_state.show_status_details = False
+    
+    with header_cols[3]:
+        if st.button("⚡ Status", key="btn_status", use_container_width=True):
+            st.session_state.show_status_details = not st.session_state.show_status_details
+            st.session_state.show_asset_details = False
+            st.session_state.show_regime_details = False
+            st.session_state.show_strategy_details = False
+    
+    # Data row - clean display without extra containers
+    _render_html(f"""
+    <div style='background: linear-gradient(135deg, rgba(15, 12, 41, 0.95) 0%, rgba(26, 26, 46, 0.95) 100%); border-radius: 16px; padding: 24px; margin-top: 30px; border: 1px solid rgba(255, 255, 255, 0.1); box-shadow: 0 8px 32px rgba(0, 0, 0, 0.4);'>
+        <div style='display: grid; grid-template-columns: repeat(4, 1fr); gap: 20px; align-items: center;'>
+            <div style='text-align: center;'>
+                <p style='margin: 0; color: #ffffff; font-size: 20px; font-weight: 700;'>{selected_symbol}</p>
+                <p style='margin: 4px 0 0 0; color: #888; font-size: 12px;'>{asset_category}</p>
+            </div>
+            <div style='text-align: center;'>
+                <p style='margin: 0; color: #ffffff; font-size: 20px; font-weight: 700;'>{regime_icon} {regime_display}</p>
+                <p style='margin: 4px 0 0 0; color: #888; font-size: 12px;'>Real-time detection</p>
+            </div>
+            <div style='text-align: center;'>
+                <p style='margin: 0; color: #00d9ff; font-size: 20px; font-weight: 700;'>🎯 {strategy_display}</p>
+                <p style='margin: 4px 0 0 0; color: #888; font-size: 12px;'>Auto-selected</p>
+            </div>
+            <div style='text-align: center;'>
+                <p style='margin: 0; color: {status_color}; font-size: 20px; font-weight: 700;'>{status_display}</p>
+                <p style='margin: 4px 0 0 0; color: #888; font-size: 12px;'>{status_detail}</p>
+            </div>
+        </div>
+    </div>
+    """)
+    
+    # Show detailed view BELOW the table if any button was clicked
+    panel = next((k for k in _PANEL_RENDERERS if st.session_state.get(f'show_{k}_details')), None)
+    if panel is not None:
+        # Add explicit spacing before detailed view to separate from AI Intelligence table
+        st.markdown("<div style='height: 40px; width: 100%; clear: both;'></div>", unsafe_allow_html=True)
+        _PANEL_RENDERERS[panel](selected_symbol, selected_asset_name, asset_category, tradingview_symbol,
+                                regime_display, regime_icon, strategy_display)
     
     # Footer section removed - no table wrapper needed
     
-    # Show error notification if there are recent errors
-    recent_errors = [e for e in trading_state.error_log if e['severity'] == 'ERROR']
-    if recent_errors:
-        st.error(f"⚠️ {len(recent_errors)} error(s)")
+    # Show error notification if there are recent errors (counted as they are logged)
+    err_count = trading_state.error_severities['ERROR']
+    if err_count:
+        st.error(f"⚠️ {err_count} error(s)")
     
     # Show notifications/signals when available
-    if trading_state.notification:
-        # Display notification with markdown formatting
-        st.markdown(trading_state.notification)
+    notification = trading_state.notification
+    if notification:
+        # Classify the signal once for the card and every button below
+        is_buy = "BUY" in notification
+        is_sell = "SELL" in notification
+        
+        # Display notification with markdown formatting - sizing advice rides in the same element
+        notification_md = notification
         
         # 🎯 PHASE 5: Show Position Sizing Recommendation for BUY signals
-        if "BUY" in trading_state.notification and hasattr(st.session_state, 'last_entry_risk_score'):
-            risk_score = st.session_state.get('last_entry_risk_score', 50)
+        risk_score = st.session_state.get('last_entry_risk_score')
+        if is_buy and risk_score is not None:
             risk_level = st.session_state.get('last_entry_risk_level', 'MEDIUM')
             
             # Calculate recommended position size reduction
             base_qty = 100  # Example: 100 shares baseline
+            risk_manager = get_session_risk_manager(settings)
             recommended_qty, sizing_explanation = risk_manager.recommend_position_size(base_qty, risk_score)
             
-            # Show position sizing recommendation
-            st.markdown("##### 💰 Recommended Position Sizing")
-            
             sizing_color = "#4caf50" if risk_level == "LOW" else "#ff9800" if risk_level == "MEDIUM" else "#f44336"
             
-            st.markdown(f"""
-            <div style='background: rgba(255,255,255,0.05); padding: 12px; border-radius: 8px; border-left: 3px solid {sizing_color}; margin-top: 15px;'>
-                <p style='margin: 0; font-size: 13px;'>{sizing_explanation}</p>
-                <p style='margin: 8px 0 0 0; color: {sizing_color}; font-size: 14px; font-weight: 600;'>
-                    💡 Suggested: {recommended_qty} shares (adjust based on your capital)
-                </p>
-            </div>
-            """, unsafe_allow_html=True)
+            # Show position sizing recommendation
+            notification_md += _SIZING_CARD_TPL.substitute(
+                sizing_color=sizing_color,
+                sizing_explanation=sizing_explanation,
+                recommended_qty=recommended_qty
+            )
+        
+        st.markdown(notification_md, unsafe_allow_html=True)
         
         # Primary action buttons
         col1, col2, col3 = st.columns([1, 1, 1])
         
         with col1:
-            if "BUY" in trading_state.notification:
+            if is_buy:
                 if st.button("✅ Execute Buy", use_container_width=True, type="primary"):
                     trading_state.position_state = 'long'
-                    st.success("✅ Position opened! Monitoring for sell signals...")
+                    _queue_toast("Position opened! Monitoring for sell signals...", icon='✅')
                     trading_state.notification = None
-                    time.sleep(2)
                     st.rerun()
         
         with col2:
-            if "SELL" in trading_state.notification:
+            if is_sell:
                 if st.button("❌ Execute Sell", use_container_width=True, type="secondary"):
                     trading_state.position_state = None
-                    st.success("✅ Position closed! Monitoring for buy signals...")
+                    _queue_toast("Position closed! Monitoring for buy signals...", icon='✅')
                     trading_state.notification = None
-                    time.sleep(2)
                     st.rerun()
         
         with col3:
@@ -2866,30 +3419,28 @@ def show_dashboard_page():
         conf_col1, conf_col2 = st.columns([1, 1])
         
         with conf_col1:
-            if "BUY" in trading_state.notification:
+            if is_buy:
                 if st.button("✅ I Bought", use_container_width=True, key="confirm_buy"):
                     # User confirmed they bought manually
                     trading_state.position_state = 'long'
                     st.session_state.user_confirmed_action = True
                     st.session_state.last_action_time = datetime.now()
-                    st.success("✅ Confirmed! AI will now monitor for exit signals.")
+                    _queue_toast("Confirmed! AI will now monitor for exit signals.", icon='✅')
                     trading_state.notification = None
-                    time.sleep(2)
                     st.rerun()
             
-            if "SELL" in trading_state.notification and trading_state.position_state == 'long':
+            if is_sell and trading_state.position_state == 'long':
                 if st.button("✅ I Sold", use_container_width=True, key="confirm_sell"):
                     # User confirmed they sold manually
                     trading_state.position_state = None
                     st.session_state.user_confirmed_action = True
                     st.session_state.last_action_time = datetime.now()
-                    st.success("✅ Confirmed! AI will scan for new opportunities.")
+                    _queue_toast("Confirmed! AI will scan for new opportunities.", icon='✅')
                     trading_state.notification = None
-                    time.sleep(2)
                     st.rerun()
         
         with conf_col2:
-            if "BUY" in trading_state.notification or "SELL" in trading_state.notification:
+            if is_buy or is_sell:
                 if st.button("❌ I Skipped", use_container_width=True, key="skip_signal"):
                     # User chose to skip this signal
                     st.session_state.user_skipped_signal = True
@@ -2897,119 +3448,53 @@ def show_dashboard_page():
                     st.session_state.skipped_strategy = trading_state.current_strategy
                     st.session_state.skipped_regime = trading_state.current_regime
                     
-                    st.warning("⚠️ Signal skipped. AI will reduce confidence for this strategy temporarily.")
+                    _queue_toast("Signal skipped. AI will reduce confidence for this strategy temporarily.", icon='⚠️')
                     trading_state.notification = None
-                    time.sleep(2)
                     st.rerun()
     
     # ============================================================================
     # ACCOUNT METRICS - Only show if trading is active
     # ============================================================================
     if trading_state.broker and trading_state.running:
-        try:
-            st.subheader("💼 Account Status")
-            acc_cols = st.columns(4)
-            
-            portfolio_value = account.get('portfolio_value', 0)
-            acc_cols[0].metric(
-                "💰 Portfolio Value",
-                f"${portfolio_value:,.2f}",
-                delta=f"{((portfolio_value / settings['initial_capital']) - 1) * 100:.2f}%"
-            )
-            
-            acc_cols[1].metric("💵 Cash", f"${account.get('cash', 0):,.2f}")
-            acc_cols[2].metric("📍 Open Positions", len(positions))
-            
-            total_pl = sum(pos.get('unrealized_pl', 0) for pos in positions)
-            acc_cols[3].metric(
-                "📈 Unrealized P&L",
-                f"${total_pl:.2f}",
-                delta=f"{(total_pl / portfolio_value * 100):.2f}%" if portfolio_value > 0 else "0%"
-            )
-            
-            # Market Intelligence & Risk
-            st.subheader("Market Analysis & Risk")
-            intel_cols = st.columns(2)
-            
-            with intel_cols[0]:
-                st.markdown("**🧠 Market Intelligence**")
-                regime_color = {
-                    'TREND': '🟢',
-                    'SIDEWAYS': '🟡',
-                    'VOLATILE': '🔴',
-                    'Unknown': '⚪'
-                }
-                st.markdown(f"- **Regime:** {regime_color.get(trading_state.current_regime, '⚪')} {trading_state.current_regime}")
-                st.markdown(f"- **Strategy:** 🎯 {trading_state.current_strategy}")
-
-            with intel_cols[1]:
-                st.markdown("**🛡️ Risk Management**")
-                risk_manager = RiskManager(
-                    initial_capital=settings['initial_capital'],
-                    max_risk_per_trade=settings['max_risk_per_trade']
-                )
-                risk_summary = risk_manager.get_risk_summary(
-                    account,
-                    {pos['symbol']: pos for pos in positions}
-                )
-                status_color_map = {
-                    'HEALTHY': '🟢',
-                    'WARNING': '🟡',
-                    'CRITICAL': '🔴'
-                }
-                st.markdown(f"- **Status:** {status_color_map.get(risk_summary['risk_status'], '⚪')} {risk_summary['risk_status']}")
-                st.markdown(f"- **Drawdown:** {risk_summary['drawdown_pct']:.2f}%")
-
-            
-            # Two columns: Positions & Trading Activity
-            left_col, right_col = st.columns([3, 2])
-            
-            with left_col:
-                st.subheader("📍 Open Positions")
-                if len(positions) > 0:
-                    positions_data = []
-                    for pos in positions:
-                        positions_data.append({
-                            'Symbol': pos['symbol'],
-                            'Quantity': pos['qty'],
-                            'Entry': f"${pos['avg_entry_price']:.2f}",
-                            'Current': f"${pos['current_price']:.2f}",
-                            'Value': f"${pos['market_value']:.2f}",
-                            'P&L': f"${pos['unrealized_pl']:.2f}",
-                            'P&L %': f"{pos.get('unrealized_plpc', 0)*100:.2f}%"
-                        })
-                    df = pd.DataFrame(positions_data)
-                    st.dataframe(df, use_container_width=True, hide_index=True)
-                else:
-                    st.info("No open positions")
-            
-            with right_col:
-                st.subheader("📊 Trading Activity")
-                if trading_state.recent_trades:
-                    st.markdown("**Recent Trades:**")
-                    for trade in trading_state.recent_trades[:5]:
-                        action_icon = "📈" if trade['action'] == 'BUY' else "📉"
-                        st.text(f"{action_icon} {trade['time'].strftime('%H:%M')} - {trade['action']} {trade['symbol']} @ ${trade['price']:.2f}")
-                else:
-                    st.info("No recent trades")
+        _render_account_status(settings)
         
-        except Exception as e:
-            st.error(f"Error fetching account data: {e}")
+        # Two columns: Positions & Trading Activity
+        left_col, right_col = st.columns([3, 2])
+        
+        with left_col:
+            _render_open_positions()
+        
+        with right_col:
+            _render_trading_activity()
     # Auto-refresh dashboard when trading is active - ONLY ONCE at the bottom
     if trading_state.running:
         # Create a container for the refresh indicator to prevent duplicates
         with st.container():
             refresh_col1, refresh_col2, refresh_col3 = st.columns([1, 2, 1])
             with refresh_col2:
-                st.markdown("""
+                _render_html("""
                 <div style='text-align: center; padding: 10px; background: rgba(0, 217, 255, 0.1); border-radius: 8px; border: 1px solid rgba(0, 217, 255, 0.3); margin-top: 20px;'>
                     <p style='margin: 0; color: #00d9ff; font-size: 14px;'>
-                        🔄 <b>Live Updates Active</b> - Refreshing every 3 seconds
+                        🔄 <b>Live Updates Active</b> - Refreshing as new data arrives
                     </p>
                 </div>
-                """, unsafe_allow_html=True)
+                """)
         
-        time.sleep(3)  # Refresh every 3 seconds for responsive UI
+        # With fragments, rerun only once something shown has changed - the account,
+        # positions, trades and scanning sections refresh themselves. Without them,
+        # one bounded sleep then a rerun: the script thread makes no st.* calls while
+        # sleeping, so clicks wait for it, and a longer poll would stall them
+        if _fragment is not None:
+            _live_refresh(live_fingerprint)
+            return
+        time.sleep(_RERUN_MIN_SECONDS)
+        st.rerun()
+    elif _trading_thread_alive():
+        # Stop was requested but the stream is still closing - rerun once it exits
+        if _fragment is not None:
+            _await_thread_exit()
+            return
+        time.sleep(_RERUN_MIN_SECONDS)
         st.rerun()
 
 
@@ -3058,13 +3543,13 @@ def show_control_page():
                 if st.button("Stop Trading", use_container_width=True, type="secondary"):
                     try:
                         trading_state.running = False
+                        trading_state.stop_event.set()
                         
                         # Close WebSocket connection if exists
                         if trading_state.stream is not None:
                             try:
                                 logger.logger.info("🔌 Closing WebSocket connection...")
                                 trading_state.stream.stop()
-                                time.sleep(1)  # Give time to properly close
                                 trading_state.stream = None
                                 logger.logger.info("✅ WebSocket closed")
                             except Exception as e:
@@ -3083,9 +3568,8 @@ def show_control_page():
                                 st.error(f"Error closing positions: {e}")
                                 log_error('Position Management', 'Error closing positions on stop', e)
                         
-                        st.success("✅ Trading stopped!")
+                        _queue_toast("Trading stopped!", icon='✅')
                         logger.logger.info("Trading stopped via UI")
-                        time.sleep(1)
                         st.rerun()
                     except Exception as e:
                         st.error(f"❌ Error stopping trading: {e}")
@@ -3226,6 +3710,53 @@ def show_help_page():
     st.success("💡 Tip: Start with paper trading and small position sizes to learn the system!")
 
 
+# Severity markers for error log entries
+_SEVERITY_ICONS = {
+    'ERROR': '🔴',
+    'WARNING': '🟡'
+}
+
+# st.dataframe row selection (Streamlit 1.35+)
+_DATAFRAME_SELECTION = 'on_select' in inspect.signature(st.dataframe).parameters
+
+
+def _render_error_details(error, show_traceback):
+    """Render the full details of one error log entry."""
+    # Summary fields share one markdown element
+    st.markdown(
+        f"**Timestamp:** {error.timestamp:%Y-%m-%d %H:%M:%S}\n\n"
+        f"**Severity:** {error.severity}\n\n"
+        f"**Type:** {error.type}\n\n"
+        f"**Message:** {error.message}"
+    )
+    
+    if error.exception:
+        st.markdown("**Exception:**")
+        st.code(error.exception, language='python')
+    
+    if error.context:
+        st.markdown("**Context:**")
+        st.code(error.context_json, language='json')
+    
+    if show_traceback and error.traceback_z:
+        st.markdown("**Full Traceback:**")
+        st.code(error.traceback, language='python')
+    
+    # Copy block - st.code carries its own copy icon and is not a stateful widget;
+    # the traceback is only decompressed when it is being shown
+    copy_text = (
+        f"Timestamp: {error.timestamp}\n"
+        f"Severity: {error.severity}\n"
+        f"Type: {error.type}\n"
+        f"Message: {error.message}\n"
+        f"Exception: {error.exception}\n"
+        f"Context: {error.context}"
+    )
+    if show_traceback:
+        copy_text += f"\nTraceback: {error.traceback}"
+    st.code(copy_text, language='text')
+
+
 def show_error_log_page():
     """Display error log viewer."""
     st.markdown(f'<h1>{get_iconly_icon("Search", 24, "#00d9ff")} Error & Debug Log</h1>', unsafe_allow_html=True)
@@ -3242,8 +3773,7 @@ def show_error_log_page():
     with col3:
         if st.button("🗑️ Clear Log", use_container_width=True):
             clear_error_log()
-            st.success("Log cleared!")
-            time.sleep(1)
+            _queue_toast("Log cleared!", icon='🗑️')
             st.rerun()
     
     # Filter options
@@ -3252,72 +3782,88 @@ def show_error_log_page():
     with col1:
         severity_filter = st.multiselect(
             "Severity",
-            options=['ERROR', 'WARNING'],
-            default=['ERROR', 'WARNING']
+            options=_SEVERITY_LEVELS,
+            default=_SEVERITY_LEVELS
         )
     
     with col2:
+        all_types = sorted(trading_state.error_types)
         type_filter = st.multiselect(
             "Error Type",
-            options=list(set([e['type'] for e in trading_state.error_log])) if trading_state.error_log else [],
-            default=list(set([e['type'] for e in trading_state.error_log])) if trading_state.error_log else []
+            options=all_types,
+            default=all_types
         )
     
     with col3:
         show_traceback = st.checkbox("Show Traceback", value=False)
+        log_size = st.select_slider(
+            "Keep Last (entries)",
+            options=_ERROR_LOG_SIZES,
+            value=trading_state.error_log.maxlen
+        )
+        if log_size != trading_state.error_log.maxlen:
+            resize_error_log(log_size)
+    
+    filtered_errors, type_counts, severity_counts = _error_log_view(severity_filter, type_filter)
     
     # Display errors
     if not trading_state.error_log:
         st.info("✅ No errors logged! System is running smoothly.")
     else:
-        # Filter errors
-        filtered_errors = [
-            e for e in trading_state.error_log
-            if e['severity'] in severity_filter and (not type_filter or e['type'] in type_filter)
-        ]
+        # One export of the whole log, serialized again only when the log changes
+        error_log_version = trading_state.error_log_version
+        if st.session_state.get('error_export_v') != error_log_version:
+            st.session_state.error_export = _dumps_indented([e.to_dict() for e in trading_state.error_log])
+            st.session_state.error_export_v = error_log_version
+        st.download_button(
+            "📥 Download All Errors (JSON)",
+            data=st.session_state.error_export,
+            file_name="errors.json",
+            mime="application/json"
+        )
         
         if not filtered_errors:
             st.info("No errors match the selected filters.")
         else:
-            for idx, error in enumerate(filtered_errors):
-                severity_color = {
-                    'ERROR': '🔴',
-                    'WARNING': '🟡'
-                }
+            if _DATAFRAME_SELECTION:
+                # One virtualized grid for the whole filtered list; details for the selected row
+                grid_key = st.session_state.error_view_key
+                if st.session_state.get('error_grid_key') != grid_key:
+                    grid = pd.DataFrame.from_records(list(map(_error_row, filtered_errors)), columns=_ERROR_FIELDS)
+                    st.session_state.error_grid = grid[['timestamp', 'severity', 'type', 'message']].rename(
+                        columns=str.capitalize)
+                    st.session_state.error_grid_key = grid_key
+                event = st.dataframe(
+                    st.session_state.error_grid,
+                    use_container_width=True,
+                    hide_index=True,
+                    on_select='rerun',
+                    selection_mode='single-row',
+                    key='error_grid_select'
+                )
+                # A stale selection can outlive the rows it pointed at once the log changes
+                selected_rows = [row for row in event.selection.rows if row < len(filtered_errors)]
+                selected = filtered_errors[selected_rows[0]] if selected_rows else filtered_errors[0]
+                st.markdown("##### Selected Error" if selected_rows else "##### Latest Error (select a row for details)")
+                _render_error_details(selected, show_traceback)
+            else:
+                # Only one page of expanders exists at a time, however long the log is
+                page_count = (len(filtered_errors) - 1) // _ERROR_PAGE_SIZE + 1
+                page = 1
+                if page_count > 1:
+                    page = st.number_input("Page", min_value=1, max_value=page_count, value=1, step=1)
+                start = (page - 1) * _ERROR_PAGE_SIZE
+                page_errors = filtered_errors[start:start + _ERROR_PAGE_SIZE]
+                st.caption(f"Showing {start + 1}-{start + len(page_errors)} of {len(filtered_errors)}")
                 
-                with st.expander(
-                    f"{severity_color.get(error['severity'], '⚪')} [{error['timestamp'].strftime('%H:%M:%S')}] {error['type']}: {error['message']}",
-                    expanded=(idx == 0)  # Expand first error
-                ):
-                    # Error details
-                    st.markdown(f"**Timestamp:** {error['timestamp'].strftime('%Y-%m-%d %H:%M:%S')}")
-                    st.markdown(f"**Severity:** {error['severity']}")
-                    st.markdown(f"**Type:** {error['type']}")
-                    st.markdown(f"**Message:** {error['message']}")
-                    
-                    if error['exception']:
-                        st.markdown("**Exception:**")
-                        st.code(error['exception'], language='python')
-                    
-                    if error['context']:
-                        st.markdown("**Context:**")
-                        st.json(error['context'])
-                    
-                    if show_traceback and error['traceback']:
-                        st.markdown("**Full Traceback:**")
-                        st.code(error['traceback'], language='python')
-                    
-                    # Copy button
-                    error_text = f"""
-Timestamp: {error['timestamp']}
-Severity: {error['severity']}
-Type: {error['type']}
-Message: {error['message']}
-Exception: {error['exception']}
-Context: {error['context']}
-Traceback: {error['traceback']}
-"""
-                    st.text_area("Copy Error Details:", error_text, height=100, key=f"error_{idx}")
+                # Expander titles for the page, built in one comprehension
+                titles = [
+                    f"{_SEVERITY_ICONS.get(e.severity, '⚪')} [{e.timestamp:%H:%M:%S}] {e.type}: {e.message}"
+                    for e in page_errors
+                ]
+                for idx, (error, title) in enumerate(zip(page_errors, titles), start):
+                    with st.expander(title, expanded=(idx == 0)):  # Expand first error
+                        _render_error_details(error, show_traceback)
     
     # Error statistics
     if trading_state.error_log:
@@ -3327,59 +3873,140 @@ Traceback: {error['traceback']}
         
         with col1:
             # Count by type
-            type_counts = {}
-            for error in trading_state.error_log:
-                error_type = error['type']
-                type_counts[error_type] = type_counts.get(error_type, 0) + 1
-            
             st.markdown("**Errors by Type:**")
-            for error_type, count in sorted(type_counts.items(), key=lambda x: x[1], reverse=True):
+            for error_type, count in type_counts.most_common():
                 st.text(f"{error_type}: {count}")
         
         with col2:
             # Count by severity
-            severity_counts = {}
-            for error in trading_state.error_log:
-                severity = error['severity']
-                severity_counts[severity] = severity_counts.get(severity, 0) + 1
-            
             st.markdown("**Errors by Severity:**")
-            for severity, count in severity_counts.items():
+            for severity, count in severity_counts.most_common():
                 st.text(f"{severity}: {count}")
         
         # Recent error timeline
         st.markdown("**Recent Error Timeline:**")
         
-        recent_errors = trading_state.error_log[:10]
-        timeline_data = []
-        
-        for error in recent_errors:
-            timeline_data.append({
-                'Time': error['timestamp'].strftime('%H:%M:%S'),
-                'Type': error['type'],
-                'Severity': error['severity'],
-                'Message': error['message'][:50] + '...' if len(error['message']) > 50 else error['message']
-            })
+        # Time and message columns are formatted vectorized, once per log change
+        df = _error_log_frame().head(10)[['time_str', 'type', 'severity', 'msg_short']]
+        df.columns = ['Time', 'Type', 'Severity', 'Message']
+        st.dataframe(df, use_container_width=True, hide_index=True)
+    
+    # Full history - paged and aggregated inside SQLite, never loaded whole
+    with st.expander("🗄️ Full Error History (archived on disk)"):
+        try:
+            error_store = get_error_store()
+            # Type options only list this session's in-memory types, so the archive is filtered
+            # by type only once the user has narrowed that selection
+            history_types = None if set(type_filter) >= set(all_types) else type_filter
+            history_count = error_store.count(severity_filter, history_types)
+            
+            if not history_count:
+                st.info("No archived errors match the selected filters.")
+            else:
+                hist_col1, hist_col2 = st.columns(2)
+                with hist_col1:
+                    st.markdown("**All-Time by Type:**")
+                    for error_type, count in error_store.counts_by('type').items():
+                        st.text(f"{error_type}: {count}")
+                with hist_col2:
+                    st.markdown("**All-Time by Severity:**")
+                    for severity, count in error_store.counts_by('severity').items():
+                        st.text(f"{severity}: {count}")
+                
+                history_pages = (history_count - 1) // _ERROR_PAGE_SIZE + 1
+                history_page = st.number_input("History Page", min_value=1, max_value=history_pages, value=1, step=1)
+                rows = error_store.page(severity_filter, history_types, limit=_ERROR_PAGE_SIZE,
+                                        offset=(history_page - 1) * _ERROR_PAGE_SIZE)
+                history_df = pd.DataFrame.from_records(rows, columns=['timestamp', 'severity', 'type', 'message'])
+                history_df.columns = ['Timestamp', 'Severity', 'Type', 'Message']
+                st.dataframe(history_df, use_container_width=True, hide_index=True)
+                st.caption(f"{history_count} archived entries match the selected filters")
+            
+            # The archive is shared by every session of this server, unlike Clear Log above
+            confirm_clear = st.checkbox("Delete the archived history for all sessions",
+                                        key="confirm_clear_error_history")
+            if st.button("🗑️ Clear History (All Sessions)", key="clear_error_history", disabled=not confirm_clear):
+                error_store.clear()
+                _queue_toast("Archived error history cleared for all sessions", icon='🗑️')
+                st.rerun()
         
-        if timeline_data:
-            df = pd.DataFrame(timeline_data)
-            st.dataframe(df, use_container_width=True, hide_index=True)
+        except Exception as e:
+            st.error(f"Error reading error history: {e}")
 
 
 # ============================================================================
 # MAIN APPLICATION
 # ============================================================================
 
-def main():
-    """Main Streamlit application."""
-    
-    # Page configuration
-    st.set_page_config(
-        page_title="Kiwi AI Trading System",
-        page_icon="📊",
-        layout="wide",
-        initial_sidebar_state="expanded"
-    )
+@st.cache_resource(show_spinner=False)
+def _sidebar_logo_html():
+    """Build the sidebar header once per process, so reruns skip reading the SVG file."""
+    return f"""
+            <div class="sidebar-logo" style="display: flex; flex-direction: column; align-items: center; text-align: center;">
+                {get_logo_svg(width="160px")}
+                <h1 class="sidebar-logo-title">Kiwi AI</h1>
+                <p class="sidebar-logo-subtitle">Trading System</p>
+            </div>
+        """
+
+
+# Web font links - preconnect to both Google Fonts hosts, then fetch the font CSS
+_FONT_LINKS_HTML = (
+    '<link rel="preconnect" href="https://fonts.googleapis.com">'
+    '<link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>'
+    '<link rel="stylesheet" href="https://fonts.googleapis.com/css2?family=Ubuntu:wght@300;400;500;600;700'
+    '&family=JetBrains+Mono:wght@400;700&display=swap">'
+)
+
+# Page name -> renderer
+_PAGES = {
+    "Dashboard": show_dashboard_page,
+    "Settings": show_settings_page,
+    "Error Log": show_error_log_page,
+    "Help": show_help_page
+}
+
+# Page names accepted from the ?page= query parameter
+_VALID_PAGES = frozenset(["Dashboard", "Control", "Settings", "Error Log", "Help"])
+
+# Pages offered in the sidebar navigation, in display order
+_NAV_PAGES = ["Dashboard", "Settings", "Error Log", "Help"]
+
+# Sidebar footer with version and trading status
+_STATUS_FOOTER_TPL = Template("""
+<div class="system-info-container" style="padding: 20px 16px; margin-bottom: 10px; text-align: center; border-top: 1px solid rgba(255, 255, 255, 0.1); background: linear-gradient(180deg, transparent 0%, rgba(15, 12, 41, 0.8) 100%); border-radius: 0 0 16px 16px; flex-shrink: 0;">
+<div style="margin-bottom: 12px;">
+<p style="color: #00d9ff; font-size: 14px; font-weight: 600; margin: 0;">Kiwi AI Trading System</p>
+<p style="color: #888; font-size: 11px; margin: 4px 0 0 0;">Version 2.5.3</p>
+</div>
+<div style="background: rgba(255, 255, 255, 0.05); border-radius: 8px; padding: 8px; display: flex; align-items: center; justify-content: center; gap: 8px; border: 1px solid rgba(255, 255, 255, 0.1);">
+<span style="font-size: 12px;">$status_icon</span>
+<span style="color: $status_color; font-size: 12px; font-weight: 600; letter-spacing: 1px;">$status_text</span>
+</div>
+<div style="margin-top: 12px;">
+<button onclick="window.parent.postMessage({type: 'streamlit:setComponentValue', value: 'error_log'}, '*')" style="background: none; border: none; color: #666; font-size: 11px; cursor: pointer; text-decoration: underline;">
+View Error Log
+</button>
+</div>
+</div>
+""")
+
+
+def _handle_query_params():
+    """Apply a ?page= query parameter (e.g. from the toolbar Settings icon) to the session."""
+    query_params = st.query_params
+    if "page" in query_params:
+        page_param = query_params["page"].replace("+", " ")  # Handle URL encoding
+        if page_param in _VALID_PAGES:
+            st.session_state.current_page = page_param
+        # Clear query params after reading
+        st.query_params.clear()
+
+
+def _inject_css():
+    """Emit the web fonts, the dashboard stylesheet and the toolbar Settings icon."""
+    # Fonts load in parallel with the stylesheet instead of behind an @import
+    st.markdown(_FONT_LINKS_HTML, unsafe_allow_html=True)
     
     # Professional Trading Dashboard CSS with Liquid Animations
     css_path = os.path.join(os.path.dirname(__file__), "assets", "css", "style.css")
@@ -3473,138 +4100,153 @@ def main():
     }})();
     </script>
     """, unsafe_allow_html=True)
+
+
+def _render_sidebar_logo():
+    """Render the sidebar header with the SVG logo."""
+    _render_html(_sidebar_logo_html())
+
+
+def _render_nav(current_page):
+    """
+    Render the sidebar page navigation.
+    
+    Args:
+        current_page: Page selected before this run
+        
+    Returns:
+        The page selected after this run
+    """
+    # Wrap navigation content in a flex container
+    st.markdown('<div class="sidebar-nav-content">', unsafe_allow_html=True)
+    
+    # Spacer to push content to middle
+    st.markdown('<div style="flex: 1;"></div>', unsafe_allow_html=True)
+    
+    # Navigation - one radio instead of a button per page; a new choice takes
+    # effect in this same run, with no extra st.rerun()
+    current_page = st.radio(
+        "Navigation",
+        _NAV_PAGES,
+        index=_NAV_PAGES.index(current_page) if current_page in _NAV_PAGES else 0,
+        label_visibility="collapsed"
+    )
+    
+    # Spacer to push footer to bottom
+    st.markdown('<div style="flex: 1;"></div>', unsafe_allow_html=True)
+    
+    # Close navigation content wrapper
+    st.markdown('</div>', unsafe_allow_html=True)
+    return current_page
+
+
+# Seconds between sidebar status refreshes (with fragments)
+_STATUS_REFRESH_SECONDS = 5
+
+
+@st.cache_data(show_spinner=False)
+def _build_status_html(running):
+    """Build the sidebar status footer; only two variants exist, each built once."""
+    return _STATUS_FOOTER_TPL.substitute(
+        status_icon="🟢" if running else "🔴",
+        status_color="#00ff88" if running else "#ff6b6b",
+        status_text="RUNNING" if running else "STOPPED"
+    )
+
+
+def _render_system_info(trading_state):
+    """Render the sidebar footer with version and trading status."""
+    _render_html(_build_status_html(trading_state.running))
+
+
+if _fragment is not None:
+    # Pick up a stop from the trading thread without waiting for a full page rerun
+    _render_system_info = _fragment(run_every=_STATUS_REFRESH_SECONDS)(_render_system_info)
+
+
+def _route(page):
+    """Render the page registered under the given name (the dashboard if unknown)."""
+    show_page = _PAGES.get(page)
+    if show_page is None:
+        # Default to dashboard if unknown page
+        st.session_state.current_page = "Dashboard"
+        show_page = show_dashboard_page
+    show_page()
+
+
+def main():
+    """Main Streamlit application."""
+    
+    # Page configuration
+    st.set_page_config(
+        page_title="Kiwi AI Trading System",
+        page_icon="📊",
+        layout="wide",
+        initial_sidebar_state="expanded"
+    )
+    
+    _handle_query_params()
+    _inject_css()
+    
+    # Show feedback queued by the action that triggered this rerun
+    pending_toast = st.session_state.pop('pending_toast', None)
+    if pending_toast:
+        st.toast(pending_toast[0], icon=pending_toast[1])
     
     # Sidebar navigation
     with st.sidebar:
         # Initialize page in session state if not exists
-        if 'current_page' not in st.session_state:
-            st.session_state.current_page = "Dashboard"
-        
-        # Professional Header with SVG Logo
-        st.markdown(f"""
-            <div class="sidebar-logo" style="display: flex; flex-direction: column; align-items: center; text-align: center;">
-                {get_logo_svg(width="160px")}
-                <h1 class="sidebar-logo-title">Kiwi AI</h1>
-                <p class="sidebar-logo-subtitle">Trading System</p>
-            </div>
-        """, unsafe_allow_html=True)
-        
-        # Wrap navigation content in a flex container
-        st.markdown('<div class="sidebar-nav-content">', unsafe_allow_html=True)
-        
-        # Professional Navigation with clickable divs - Collapsible menu
-        current_page = st.session_state.current_page
-        
-        # Initialize dashboard expanded state
-        if 'dashboard_expanded' not in st.session_state:
-            st.session_state.dashboard_expanded = True
-        
-        # Check for query parameter navigation and handle clicks
-        query_params = st.query_params
-        if "page" in query_params:
-            page_param = query_params["page"].replace("+", " ")  # Handle URL encoding
-            if page_param in ["Dashboard", "Control", "Settings", "Error Log", "Help"]:
-                st.session_state.current_page = page_param
-            # Clear query params after reading
-            st.query_params.clear()
-            st.rerun()
-        
-        # Spacer to push content to middle
-        st.markdown('<div style="flex: 1;"></div>', unsafe_allow_html=True)
-        
-        # Navigation Buttons - Centered
-        if st.button("Dashboard", key="nav_dashboard", use_container_width=True, 
-                    type="primary" if current_page == "Dashboard" else "secondary"):
-            st.session_state.current_page = "Dashboard"
-            st.rerun()
-            
-        if st.button("Settings", key="nav_settings", use_container_width=True, 
-                    type="primary" if current_page == "Settings" else "secondary"):
-            st.session_state.current_page = "Settings"
-            st.rerun()
-            
-        if st.button("Help", key="nav_help", use_container_width=True, 
-                    type="primary" if current_page == "Help" else "secondary"):
-            st.session_state.current_page = "Help"
-            st.rerun()
-        
-        # Spacer to push footer to bottom
-        st.markdown('<div style="flex: 1;"></div>', unsafe_allow_html=True)
-        
-        # Close navigation content wrapper
-        st.markdown('</div>', unsafe_allow_html=True)
-        
-        # Get trading status for footer
-        status_text = "RUNNING" if trading_state.running else "STOPPED"
-        status_color = "#00ff88" if trading_state.running else "#ff6b6b"
-        status_icon = "🟢" if trading_state.running else "🔴"
+        st.session_state.setdefault('current_page', "Dashboard")
+        st.session_state.setdefault('dashboard_expanded', True)
         
-        st.markdown(f"""
-<div class="system-info-container" style="padding: 20px 16px; margin-bottom: 10px; text-align: center; border-top: 1px solid rgba(255, 255, 255, 0.1); background: linear-gradient(180deg, transparent 0%, rgba(15, 12, 41, 0.8) 100%); border-radius: 0 0 16px 16px; flex-shrink: 0;">
-<div style="margin-bottom: 12px;">
-<p style="color: #00d9ff; font-size: 14px; font-weight: 600; margin: 0;">Kiwi AI Trading System</p>
-<p style="color: #888; font-size: 11px; margin: 4px 0 0 0;">Version 2.5.3</p>
-</div>
-<div style="background: rgba(255, 255, 255, 0.05); border-radius: 8px; padding: 8px; display: flex; align-items: center; justify-content: center; gap: 8px; border: 1px solid rgba(255, 255, 255, 0.1);">
-<span style="font-size: 12px;">{status_icon}</span>
-<span style="color: {status_color}; font-size: 12px; font-weight: 600; letter-spacing: 1px;">{status_text}</span>
-</div>
-<div style="margin-top: 12px;">
-<button onclick="window.parent.postMessage({{type: 'streamlit:setComponentValue', value: 'error_log'}}, '*')" style="background: none; border: none; color: #666; font-size: 11px; cursor: pointer; text-decoration: underline;">
-View Error Log
-</button>
-</div>
-</div>
-""", unsafe_allow_html=True)
+        _render_sidebar_logo()
+        st.session_state.current_page = _render_nav(st.session_state.current_page)
+        _render_system_info(trading_state)
         
         # Handle Error Log click from footer (simulated via button above or just standard nav)
         if st.session_state.get('show_error_log_footer'):
             st.session_state.current_page = "Error Log"
             st.session_state.show_error_log_footer = False
             st.rerun()
-
-        
-        # Update page variable for routing
-        page = st.session_state.current_page
-    
-    # End of sidebar
-    
-    # Route to appropriate page
-    if page == "Dashboard":
-        show_dashboard_page()
-    elif page == "Settings":
-        show_settings_page()
-    elif page == "Error Log":
-        show_error_log_page()
-    elif page == "Help":
-        show_help_page()
-    else:
-        # Default to dashboard if unknown page
-        st.session_state.current_page = "Dashboard"
-        show_dashboard_page()
     
-    # Auto-refresh for live updates (every 5 seconds when running)
-    if trading_state.running:
-        time.sleep(5)
-        st.rerun()
+    _route(st.session_state.current_page)
+
+
+# Startup message, written in one call
+_BANNER = "\n".join([
+    "",
+    "=" * 80,
+    f"{'🥝 KIWI AI TRADING SYSTEM 🥝':^80}",
+    "=" * 80,
+    f"{'Starting Web Dashboard...':^80}",
+    "=" * 80,
+    "",
+    "  🌐 Dashboard will open at: http://localhost:8501",
+    "  📖 Use the sidebar to navigate between pages",
+    "  ⚙️  Configure your API keys in the Settings page",
+    "  🎮 Start trading from the Control page",
+    "",
+    "  Press Ctrl+C to stop the application",
+    "",
+    "=" * 80 + "\n",
+    ""
+])
+
+
+@st.cache_resource(show_spinner=False)
+def _print_banner():
+    """
+    Write the startup banner once per server process (not on every script rerun).
+
+    Skipped when stdout is not a terminal (services, containers, captured pipes).
+    """
+    if sys.stdout.isatty():
+        sys.stdout.write(_BANNER)
+        sys.stdout.flush()
 
 
 if __name__ == "__main__":
     # Print startup message
-    print("\n" + "=" * 80)
-    print("=" * 80)
-    print(f"{'🥝 KIWI AI TRADING SYSTEM 🥝':^80}")
-    print("=" * 80)
-    print(f"{'Starting Web Dashboard...':^80}")
-    print("=" * 80)
-    print()
-    print("  🌐 Dashboard will open at: http://localhost:8501")
-    print("  📖 Use the sidebar to navigate between pages")
-    print("  ⚙️  Configure your API keys in the Settings page")
-    print("  🎮 Start trading from the Control page")
-    print()
-    print("  Press Ctrl+C to stop the application")
-    print()
-    print("=" * 80 + "\n")
+    _print_banner()
     
     main()
@@ -0,0 +1,178 @@
+"""
+Error Store Module
+Disk-backed archive of dashboard errors and warnings (SQLite).
+
+The dashboard keeps only a bounded window of recent entries in memory; every
+entry is also written here so the full history can be paged through and
+aggregated by SQLite without holding it in the Python process.
+"""
+
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+import config
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS errors (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    severity TEXT NOT NULL,
+    type TEXT NOT NULL,
+    message TEXT NOT NULL,
+    exception TEXT,
+    context TEXT,
+    traceback BLOB
+);
+CREATE INDEX IF NOT EXISTS idx_errors_severity_type_ts ON errors (severity, type, ts DESC);
+"""
+
+
+class ErrorStore:
+    """
+    SQLite archive of error log entries, capped at the newest max_rows.
+
+    One connection is shared across threads (the trading loop logs from its own
+    thread), serialized by a lock.
+    """
+
+    def __init__(self, db_file: str, max_rows: int):
+        """
+        Open (or create) the archive.
+
+        Args:
+            db_file: Path to the SQLite file
+            max_rows: Entries kept; older ones are deleted as new ones arrive
+        """
+        self.max_rows = max_rows
+        path = Path(db_file)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.executescript(_SCHEMA)
+
+    def add(
+        self,
+        timestamp: datetime,
+        severity: str,
+        error_type: str,
+        message: str,
+        exception: Optional[str] = None,
+        context: Optional[dict] = None,
+        traceback_z: Optional[bytes] = None
+    ):
+        """
+        Archive one entry, pruning the oldest beyond max_rows.
+
+        Args:
+            timestamp: When the entry was logged
+            severity: 'ERROR' or 'WARNING'
+            error_type: Entry type (e.g., 'API', 'Trading')
+            message: Human-readable message
+            exception: Exception text (if any)
+            context: Additional context, stored as JSON
+            traceback_z: zlib-compressed formatted traceback (if any)
+        """
+        with self._lock, self._conn:
+            row_id = self._conn.execute(
+                "INSERT INTO errors (ts, severity, type, message, exception, context, traceback) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (timestamp.timestamp(), severity, error_type, message, exception,
+                 json.dumps(context, default=str) if context else None, traceback_z)
+            ).lastrowid
+            # Ids only grow, so everything at or below row_id - max_rows is older than the cap
+            self._conn.execute("DELETE FROM errors WHERE id <= ?", (row_id - self.max_rows,))
+
+    @staticmethod
+    def _where(severities: Optional[Sequence[str]], types: Optional[Sequence[str]]):
+        """
+        Build the WHERE clause and parameters for a severity/type filter.
+
+        None leaves that column unfiltered; an empty selection matches nothing.
+        """
+        clauses, params = [], []
+        for column, selected in (('severity', severities), ('type', types)):
+            if selected is None:
+                continue
+            if not selected:
+                return " WHERE 0", []
+            clauses.append(f"{column} IN ({','.join('?' * len(selected))})")
+            params.extend(selected)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def count(
+        self,
+        severities: Optional[Sequence[str]] = None,
+        types: Optional[Sequence[str]] = None
+    ) -> int:
+        """Return how many archived entries match the filter."""
+        where, params = self._where(severities, types)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM errors{where}", params).fetchone()[0]
+
+    def page(
+        self,
+        severities: Optional[Sequence[str]] = None,
+        types: Optional[Sequence[str]] = None,
+        limit: int = 50,
+        offset: int = 0
+    ) -> List[Dict]:
+        """
+        Return one page of matching entries, newest first.
+
+        The traceback is returned still compressed (key 'traceback_z').
+        """
+        where, params = self._where(severities, types)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT ts, severity, type, message, exception, context, traceback FROM errors{where} "
+                "ORDER BY ts DESC LIMIT ? OFFSET ?",
+                (*params, limit, offset)
+            ).fetchall()
+        return [
+            {
+                'timestamp': datetime.fromtimestamp(row['ts']),
+                'severity': row['severity'],
+                'type': row['type'],
+                'message': row['message'],
+                'exception': row['exception'],
+                'context': json.loads(row['context']) if row['context'] else {},
+                'traceback_z': row['traceback']
+            }
+            for row in rows
+        ]
+
+    def counts_by(self, column: str) -> Dict[str, int]:
+        """Return entry counts grouped by 'type' or 'severity', largest first."""
+        if column not in ('type', 'severity'):
+            raise ValueError(f"Cannot group errors by {column!r}")
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {column}, COUNT(*) AS n FROM errors GROUP BY {column} ORDER BY n DESC"
+            ).fetchall()
+        return {row[0]: row[1] for row in rows}
+
+    def clear(self):
+        """Delete every archived entry."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM errors")
+
+
+@lru_cache(maxsize=None)
+def get_error_store(db_file: str = None) -> ErrorStore:
+    """
+    Get the process-wide error store for a database file.
+
+    Args:
+        db_file: Path to the SQLite file (if None, uses config.ERROR_DB_FILE)
+
+    Returns:
+        ErrorStore instance
+    """
+    return ErrorStore(db_file or config.ERROR_DB_FILE, config.ERROR_DB_MAX_ROWS)
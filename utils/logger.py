@@ -3,13 +3,41 @@ Logging Configuration Module
 Provides centralized logging setup for the Kiwi_AI system.
 """
 
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
 from pathlib import Path
 from datetime import datetime
 import config
 
 
+# Log file path -> queue drained to that file by a background listener thread
+_file_queues = {}
+
+
+def _file_queue(log_file: str, formatter: logging.Formatter) -> queue.Queue:
+    """
+    Get the queue feeding a log file, starting its writer thread on first use.
+
+    Loggers format each record on the calling thread (QueueHandler.prepare) and
+    enqueue it; one QueueListener per file does the disk writes in the background.
+    """
+    key = str(Path(log_file).resolve())
+    log_queue = _file_queues.get(key)
+    if log_queue is None:
+        file_handler = logging.FileHandler(log_file, encoding='utf-8')
+        file_handler.setLevel(logging.DEBUG)
+        file_handler.setFormatter(formatter)
+        log_queue = queue.Queue(-1)
+        listener = logging.handlers.QueueListener(log_queue, file_handler, respect_handler_level=True)
+        listener.start()
+        atexit.register(listener.stop)  # Flush queued records on exit
+        _file_queues[key] = log_queue
+    return log_queue
+
+
 def setup_logger(
     name: str = "kiwi_ai",
     level: str = None,
@@ -62,9 +90,8 @@ def setup_logger(
         log_path = Path(log_file)
         log_path.parent.mkdir(parents=True, exist_ok=True)
         
-        file_handler = logging.FileHandler(log_file, encoding='utf-8')
+        file_handler = logging.handlers.QueueHandler(_file_queue(log_file, detailed_formatter))
         file_handler.setLevel(logging.DEBUG)
-        file_handler.setFormatter(detailed_formatter)
         logger.addHandler(file_handler)
     
     # Prevent propagation to root logger
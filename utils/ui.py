@@ -1,15 +1,37 @@
 import streamlit as st
 import os
+import re
+from functools import lru_cache
+
+
+@lru_cache(maxsize=8)
+def _style_tag(css_file_path, mtime):
+    """
+    Read and minify a CSS file into a <style> tag, once per file version.
+
+    Args:
+        css_file_path (str): Path to the CSS file.
+        mtime (float): File modification time; a new value re-reads the file.
+    """
+    with open(css_file_path, "r") as f:
+        css = f.read()
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)  # Drop comments
+    css = re.sub(r"\s+", " ", css).strip()  # Collapse whitespace
+    return f"<style>{css}</style>"
+
 
 def load_css(css_file_path):
     """
     Load CSS from a file and inject it into the Streamlit app.
-    
+
+    The file is read and minified only when it changes; every rerun still
+    emits the tag, since Streamlit drops elements a run does not re-emit.
+
     Args:
         css_file_path (str): Relative path to the CSS file.
     """
     try:
-        with open(css_file_path, "r") as f:
-            st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
+        style_tag = _style_tag(css_file_path, os.path.getmtime(css_file_path))
+        st.markdown(style_tag, unsafe_allow_html=True)
     except Exception as e:
         st.error(f"Failed to load CSS file: {e}")